@@ -8,9 +8,28 @@ import websockets
 import json
 import logging
 import aiohttp
+import zlib
 from datetime import datetime
 from typing import Dict, Optional, Callable
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Guardian sends MessagePack binary frames to clients offering this subprotocol
+MSGPACK_SUBPROTOCOL = "aegis.msgpack.v1"
+FRAME_ZLIB = 0x01
+
+def _decode_frame(message) -> Dict:
+    """Decode a Guardian frame: JSON text/bytes, or a tagged MessagePack body"""
+    if isinstance(message, bytes) and msgspec is not None and message[:1] in (b'\x00', b'\x01'):
+        body = message[1:]
+        if message[0] == FRAME_ZLIB:
+            body = zlib.decompress(body)
+        return msgspec.msgpack.decode(body)
+    return json.loads(message)
+
 class Communicator:
     def __init__(self, config, jwt_auth):
         self.config = config
@@ -57,10 +76,19 @@ class Communicator:
             # Then establish WebSocket connection
             headers = {'Authorization': f'Bearer {self.auth_token}'} if self.auth_token else {}
             
-            self.websocket = await websockets.connect(
-                self.config['guardian']['server_url'],
-                extra_headers=headers
-            )
+            if msgspec is not None:
+                # Large frames arrive already compressed, so skip permessage-deflate
+                self.websocket = await websockets.connect(
+                    self.config['guardian']['server_url'],
+                    extra_headers=headers,
+                    subprotocols=[MSGPACK_SUBPROTOCOL],
+                    compression=None
+                )
+            else:
+                self.websocket = await websockets.connect(
+                    self.config['guardian']['server_url'],
+                    extra_headers=headers
+                )
             
             self.connected = True
             self.logger.info("Connected to Guardian server")
@@ -116,7 +144,7 @@ class Communicator:
         while self.running and self.connected:
             try:
                 message = await self.websocket.recv()
-                data = json.loads(message)
+                data = _decode_frame(message)
                 await self.handle_message(data)
                 
             except websockets.exceptions.ConnectionClosed:
@@ -78,11 +78,15 @@ export default function PeerPage() {
       };
 
       websocket.onmessage = (event) => {
-        const data = JSON.parse(event.data);
-        if (data.type === "metrics_update") {
-          setSystemMetrics(data.metrics);
-        } else if (data.type === "connection_status") {
-          setConnectionStatus(data.status);
+        // The peer batches messages queued close together into one array frame
+        const payload = JSON.parse(event.data);
+        const messages = Array.isArray(payload) ? payload : [payload];
+        for (const data of messages) {
+          if (data.type === "metrics_update") {
+            setSystemMetrics(data.metrics);
+          } else if (data.type === "connection_status") {
+            setConnectionStatus(data.status);
+          }
         }
       };
 
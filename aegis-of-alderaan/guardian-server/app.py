@@ -13,20 +13,25 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depe
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 import asyncio
+import atexit
 import logging
+import queue
 import json
+from logging.handlers import QueueHandler, QueueListener
+from dataclasses import asdict
 from datetime import datetime
 from typing import Dict, List, Optional
 import uvicorn
 
 from websocket_handler import WebSocketManager
+from websocket_bus import WebSocketBus
 from jwt_utils import JWTManager
 from remediation_engine import RemediationEngine
 from db.mongo_handler import MongoHandler
 from db.neo4j_handler import Neo4jHandler
 from gemini_ai_handler import GeminiAIHandler
 from models.agent import AgentModel
-from models.metrics import MetricsModel, SystemMetrics, AnomalyModel
+from models.metrics import MetricsModel, AnomalyModel
 from models.auth import AuthModel
 from models.distributed import PeerRegistrationModel, PeerMetricsPayload
 
@@ -47,9 +52,17 @@ app.add_middleware(
 )
 
 # Initialize components
-websocket_manager = WebSocketManager()
 jwt_manager = JWTManager()
 
+# With several guardian workers, relay WebSocket traffic between them over Redis
+websocket_bus = None
+if os.getenv('WEBSOCKET_BUS_REDIS_URL'):
+    try:
+        websocket_bus = WebSocketBus(os.getenv('WEBSOCKET_BUS_REDIS_URL'))
+    except ImportError as e:
+        print(f"Warning: WebSocket bus unavailable: {e}")
+websocket_manager = WebSocketManager(jwt_manager, websocket_bus)
+
 # Initialize database handlers with error handling
 try:
     mongo_handler = MongoHandler()
@@ -79,8 +92,16 @@ distributed_manager = DistributedNodeManager(jwt_manager)
 # Security
 security = HTTPBearer()
 
-# Logging setup
+# Logging setup - records are formatted and written by a listener thread so
+# log I/O never blocks the event loop
 logging.basicConfig(level=logging.INFO)
+_root_logger = logging.getLogger()
+_log_queue = queue.SimpleQueue()
+log_listener = QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [QueueHandler(_log_queue)]
+log_listener.start()
+# Stopped at exit, after uvicorn's own shutdown logging has been queued
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
@@ -88,6 +109,10 @@ async def startup_event():
     """Initialize services on startup"""
     logger.info("🛡️ Starting Aegis Guardian Server...")
     
+    # Tasks run synchronously up to their first real suspension point (3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Initialize database connections
     if mongo_handler:
         try:
@@ -101,6 +126,11 @@ async def startup_event():
         except Exception as e:
             logger.warning(f"Neo4j connection failed: {e}")
     
+    try:
+        await websocket_manager.start_bus()
+    except Exception as e:
+        logger.warning(f"WebSocket bus start failed: {e}")
+    
     # Start remediation engine
     if remediation_engine:
         try:
@@ -117,10 +147,12 @@ async def shutdown_event():
     
     if remediation_engine:
         await remediation_engine.stop()
+    await websocket_manager.stop_bus()
     if mongo_handler:
         await mongo_handler.disconnect()
     if neo4j_handler:
         await neo4j_handler.disconnect()
+    gemini_ai.shutdown()
     
     logger.info("✅ Guardian Server shutdown complete")
 
@@ -1013,6 +1045,8 @@ async def handle_agent_message(websocket: WebSocket, message: Dict):
     if message_type == "register":
         await websocket_manager.register_agent(websocket, agent_id)
         await neo4j_handler.create_or_update_agent_node(agent_id, message)
+        if remediation_engine:
+            remediation_engine.record_heartbeat(agent_id)
         
     elif message_type == "metrics":
         # Store metrics in MongoDB
@@ -1046,6 +1080,8 @@ async def handle_agent_message(websocket: WebSocket, message: Dict):
         # Update agent status
         await mongo_handler.update_agent_heartbeat(agent_id)
         await neo4j_handler.update_agent_status(agent_id, "active")
+        if remediation_engine:
+            remediation_engine.record_heartbeat(agent_id)
 
 async def handle_dashboard_message(websocket: WebSocket, message: Dict):
     """Handle messages from dashboard"""
@@ -1096,7 +1132,7 @@ async def ai_analyze_health(agent_id: str):
         
         return {
             "agent_id": agent_id,
-            "analysis": health_analysis.__dict__,
+            "analysis": asdict(health_analysis),
             "timestamp": datetime.utcnow().isoformat(),
             "ai_enabled": gemini_ai.enabled
         }
@@ -1127,7 +1163,7 @@ async def ai_mirror_recommendation(agent_id: str):
         
         return {
             "agent_id": agent_id,
-            "recommendation": recommendation.__dict__,
+            "recommendation": asdict(recommendation),
             "available_mirrors": available_mirrors,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -1165,7 +1201,7 @@ async def ai_healing_strategy(agent_id: str):
         
         return {
             "agent_id": agent_id,
-            "health_analysis": health_analysis.__dict__,
+            "health_analysis": asdict(health_analysis),
             "healing_strategy": strategy,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -1174,6 +1210,47 @@ async def ai_healing_strategy(agent_id: str):
         logger.error(f"AI healing strategy generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ai/diagnose/{agent_id}")
+async def ai_full_diagnosis(agent_id: str):
+    """Run health analysis, failure prediction, mirror recommendation and healing strategy together"""
+    try:
+        if not neo4j_handler or not mongo_handler:
+            raise HTTPException(status_code=503, detail="Database services not available")
+        
+        agent_data = await mongo_handler.get_agent(agent_id)
+        if not agent_data:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        
+        mirror_health = await neo4j_handler.check_mirror_health(agent_id)
+        node_data = {
+            **agent_data,
+            'health_issues': mirror_health.get('health_issues', []),
+            'mirrors': mirror_health.get('mirrors', [])
+        }
+        
+        available_mirrors = []
+        for mirror_id in mirror_health.get('mirrors', []):
+            mirror_data = await mongo_handler.get_agent(mirror_id)
+            if mirror_data:
+                available_mirrors.append(mirror_data)
+        
+        historical_data = await mongo_handler.get_agent_metrics(agent_id, limit=100)
+        
+        diagnosis = await gemini_ai.full_node_diagnosis(node_data, available_mirrors, historical_data)
+        
+        return {
+            "agent_id": agent_id,
+            "health_analysis": asdict(diagnosis["health_analysis"]),
+            "failure_prediction": diagnosis["failure_prediction"],
+            "mirror_recommendation": asdict(diagnosis["mirror_recommendation"]),
+            "healing_strategy": diagnosis["healing_strategy"],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"AI full diagnosis failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/ai/mirror/activate/{agent_id}")
 async def ai_activate_mirror(agent_id: str):
     """Activate mirror based on AI recommendation"""
@@ -1196,7 +1273,7 @@ async def ai_activate_mirror(agent_id: str):
                 "agent_id": agent_id,
                 "action": "no_activation_needed",
                 "reason": "AI recommends not to activate mirror",
-                "recommendation": recommendation.__dict__
+                "recommendation": asdict(recommendation)
             }
         
         if not recommendation.mirror_node_id:
@@ -1225,7 +1302,7 @@ async def ai_activate_mirror(agent_id: str):
             "action": "mirror_activated",
             "mirror_agent": recommendation.mirror_node_id,
             "strategy": recommendation.transition_strategy,
-            "ai_recommendation": recommendation.__dict__,
+            "ai_recommendation": asdict(recommendation),
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -1291,28 +1368,20 @@ async def get_ai_mirror_topology():
         # Get mirror topology from Neo4j
         topology = await neo4j_handler.get_mirror_topology()
         
-        # Add AI analysis for each primary node
+        # Collect node data for each primary node
         ai_enhanced_topology = {}
+        analyzable = {}
         for primary_agent, data in topology.items():
             try:
-                # Get current health analysis
                 agent_data = await mongo_handler.get_agent(primary_agent) if mongo_handler else {}
                 mirror_health = await neo4j_handler.check_mirror_health(primary_agent)
                 
-                node_data = {
+                analyzable[primary_agent] = {
                     **agent_data,
                     'health_issues': mirror_health.get('health_issues', []),
                     'mirrors': mirror_health.get('mirrors', [])
                 }
                 
-                health_analysis = await gemini_ai.analyze_node_health(node_data)
-                
-                ai_enhanced_topology[primary_agent] = {
-                    **data,
-                    'ai_health_analysis': health_analysis.__dict__,
-                    'ai_enabled': gemini_ai.enabled
-                }
-                
             except Exception as e:
                 logger.warning(f"Failed to get AI analysis for {primary_agent}: {e}")
                 ai_enhanced_topology[primary_agent] = {
@@ -1321,6 +1390,15 @@ async def get_ai_mirror_topology():
                     'ai_enabled': False
                 }
         
+        # Analyze all collected nodes in one batch
+        health_analyses = await gemini_ai.analyze_nodes_health(list(analyzable.values()))
+        for primary_agent, health_analysis in zip(analyzable, health_analyses):
+            ai_enhanced_topology[primary_agent] = {
+                **topology[primary_agent],
+                'ai_health_analysis': asdict(health_analysis),
+                'ai_enabled': gemini_ai.enabled
+            }
+        
         return {
             "mirror_topology": ai_enhanced_topology,
             "total_primary_nodes": len(ai_enhanced_topology),
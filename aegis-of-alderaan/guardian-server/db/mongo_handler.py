@@ -8,6 +8,7 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 import os
 from dotenv import load_dotenv
 
@@ -308,6 +309,20 @@ class MongoHandler:
             self.logger.error(f"Failed to store remediation: {e}")
             raise
     
+    async def bulk_upsert(self, collection: str, key: str, docs: List[Dict]):
+        """Upsert documents matched on `key` in one round trip, applied in order"""
+        if not docs:
+            return
+        
+        try:
+            await self.db[self.collections[collection]].bulk_write(
+                [UpdateOne({key: doc[key]}, {'$set': doc}, upsert=True) for doc in docs]
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(docs)} {collection} records: {e}")
+            raise
+    
     async def update_remediation(self, remediation_id: str, remediation_data: Dict):
         """Update remediation record"""
         try:
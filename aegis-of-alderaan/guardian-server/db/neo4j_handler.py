@@ -5,7 +5,7 @@ Neo4j interface for graph-based network topology and relationships
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from neo4j import AsyncGraphDatabase
 import os
 from dotenv import load_dotenv
@@ -21,6 +21,15 @@ class Neo4jHandler:
         self.password = password or os.getenv('NEO4J_PASSWORD', 'your-password')
         self.driver = None
         self.logger = logging.getLogger(__name__)
+        
+        # Called with an agent_id whenever that agent's mirror relationships change
+        self.mirror_listeners: List[Callable[[str], None]] = []
+    
+    def _notify_mirror_changed(self, *agent_ids: str):
+        """Tell listeners (e.g. mirror caches) which agents changed"""
+        for listener in self.mirror_listeners:
+            for agent_id in agent_ids:
+                listener(agent_id)
     
     async def connect(self):
         """Connect to Neo4j Cloud (Aura) or hosted instance"""
@@ -288,6 +297,7 @@ class Neo4jHandler:
                 
                 await session.run(query, primary_agent=primary_agent, mirror_agent=mirror_agent)
                 self.logger.info(f"Mirror relationship created: {primary_agent} <-> {mirror_agent}")
+                self._notify_mirror_changed(primary_agent, mirror_agent)
                 
         except Exception as e:
             self.logger.error(f"Failed to create mirror relationship: {e}")
@@ -511,6 +521,7 @@ class Neo4jHandler:
                     )
                 
                 self.logger.info(f"Mirror setup: {primary_agent} -> {mirror_agent} ({mirror_type}, priority: {priority})")
+                self._notify_mirror_changed(primary_agent, mirror_agent)
                 
         except Exception as e:
             self.logger.error(f"Failed to setup agent mirroring: {e}")
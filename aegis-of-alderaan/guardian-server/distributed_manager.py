@@ -26,7 +26,7 @@ class NodeStatus(Enum):
     CONNECTING = "connecting"
     ERROR = "error"
 
-@dataclass
+@dataclass(slots=True)
 class NodeInfo:
     node_id: str
     node_type: NodeType
@@ -55,7 +55,7 @@ class NodeInfo:
             "connections": list(self.connections)
         }
 
-@dataclass
+@dataclass(slots=True)
 class PeerConnection:
     peer_id: str
     websocket: Optional[object]
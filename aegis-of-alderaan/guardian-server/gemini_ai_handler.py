@@ -7,12 +7,282 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple, TypedDict
 from datetime import datetime
+import numpy as np
 import google.generativeai as genai
-from dataclasses import dataclass
+from pydantic import BaseModel
+from dataclasses import asdict, dataclass, field
 
-@dataclass
+from llm_cache import LLMCache, InMemoryCacheBackend, RedisCacheBackend
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj, indent: bool = True) -> str:
+    """Serialize prompt data with sorted keys, using orjson when available
+
+    Sorting keeps equivalent payloads byte-identical so they share cache keys.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str).decode()
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=True, default=str)
+
+def _loads(text: str):
+    """Parse a JSON response, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Fields forwarded to Gemini for failure prediction; everything else is dropped
+# before serialization to keep prompt tokens down. Node identity is rendered
+# separately by _node_static_section.
+PREDICTION_NODE_FIELDS = ('metrics', 'status', 'health_issues')
+# Numeric history is reduced to per-metric baseline stats
+PREDICTION_STAT_FIELDS = ('cpu_percent', 'memory_percent', 'disk_percent')
+# Most recent samples also sent as compact [timestamp, cpu, memory, disk] rows
+# so the model still sees order and trend
+PREDICTION_TAIL_LIMIT = 10
+PROMPT_ERROR_LOG_LIMIT = 10
+
+GEMINI_MODEL_NAME = 'gemini-2.0-flash-exp'
+
+# Rule-based fallback, indexed by severity level (0 = worst)
+FALLBACK_SEVERITIES = ('critical', 'high', 'medium')
+FALLBACK_ACTIONS = (
+    ('Restart services', 'Clear cache', 'Scale resources'),
+    ('Monitor closely', 'Optimize processes'),
+    ('Regular monitoring',),
+)
+
+# Static instructions and response schemas, sent once per model as the system
+# instruction so each request only carries the per-node data
+HEALTH_PREAMBLE = """
+You are an expert system administrator analyzing the health of a network monitoring agent.
+
+Please provide a comprehensive health analysis in the following JSON format:
+{
+    "severity": "critical|high|medium|low",
+    "root_cause": "detailed explanation of the primary issue",
+    "healing_strategy": "recommended healing approach",
+    "mirror_recommendation": "should_activate|attempt_heal|monitor_closely",
+    "estimated_recovery_time": minutes_as_integer,
+    "confidence_score": 0.0_to_1.0,
+    "immediate_actions": ["action1", "action2", "action3"],
+    "preventive_measures": ["measure1", "measure2", "measure3"]
+}
+
+Consider the following in your analysis:
+1. Resource utilization patterns
+2. Error frequency and severity
+3. Network connectivity issues
+4. Historical performance trends
+5. Critical service dependencies
+6. Recovery complexity and time requirements
+"""
+
+MIRROR_PREAMBLE = """
+You are an expert in distributed systems and high availability architectures.
+
+Please analyze whether to activate a mirror node and provide recommendation in JSON format:
+{
+    "should_activate_mirror": true/false,
+    "mirror_node_id": "best_mirror_candidate_or_null",
+    "transition_strategy": "immediate|gradual|conditional",
+    "rollback_conditions": ["condition1", "condition2"],
+    "risk_assessment": "low|medium|high",
+    "reasoning": "detailed explanation"
+}
+
+Consider:
+1. Primary node recovery probability and time
+2. Mirror node readiness and capacity
+3. Service continuity requirements
+4. Data consistency implications
+5. Performance impact during transition
+6. Risk of cascade failures
+"""
+
+STRATEGY_PREAMBLE = """
+You are an expert system administrator creating a detailed healing strategy.
+
+Create a comprehensive healing strategy with step-by-step actions in JSON format:
+{
+    "strategy_id": "unique_identifier",
+    "priority": "immediate|urgent|normal|low",
+    "phases": [
+        {
+            "phase": "immediate_stabilization",
+            "actions": ["action1", "action2"],
+            "expected_duration": minutes,
+            "success_criteria": ["criteria1", "criteria2"]
+        },
+        {
+            "phase": "root_cause_resolution",
+            "actions": ["action1", "action2"],
+            "expected_duration": minutes,
+            "success_criteria": ["criteria1", "criteria2"]
+        },
+        {
+            "phase": "system_optimization",
+            "actions": ["action1", "action2"],
+            "expected_duration": minutes,
+            "success_criteria": ["criteria1", "criteria2"]
+        }
+    ],
+    "monitoring_points": ["metric1", "metric2"],
+    "rollback_triggers": ["trigger1", "trigger2"],
+    "estimated_total_time": total_minutes
+}
+"""
+
+PREDICTION_PREAMBLE = """
+You are an expert in predictive analytics for distributed systems.
+
+Analyze patterns and predict failure risk in JSON format:
+{
+    "risk_level": "critical|high|medium|low",
+    "confidence": 0.0_to_1.0,
+    "time_to_failure": "estimated_hours_or_null",
+    "failure_indicators": ["indicator1", "indicator2"],
+    "trending_metrics": ["metric1_direction", "metric2_direction"],
+    "recommended_actions": ["action1", "action2"]
+}
+"""
+
+def _project(data: Dict, fields: Tuple[str, ...] = PREDICTION_NODE_FIELDS) -> Dict:
+    """Project a record onto the given fields for prompt serialization"""
+    return {key: data[key] for key in fields if key in data}
+
+def _score_severity_numpy(cpu: np.ndarray, memory: np.ndarray) -> np.ndarray:
+    """Fallback severity level per node (0 = critical, 1 = high, 2 = medium)"""
+    return np.where((cpu > 90) | (memory > 90), 0, np.where((cpu > 70) | (memory > 70), 1, 2)).astype(np.int8)
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _score_severity(cpu, memory):
+        """Fallback severity level per node, compiled and run across cores"""
+        out = np.empty(cpu.shape[0], np.int8)
+        for i in numba.prange(cpu.shape[0]):
+            if cpu[i] > 90 or memory[i] > 90:
+                out[i] = 0
+            elif cpu[i] > 70 or memory[i] > 70:
+                out[i] = 1
+            else:
+                out[i] = 2
+        return out
+else:
+    _score_severity = _score_severity_numpy
+
+@functools.lru_cache(maxsize=1024)
+def _node_static_section(agent_id: str, role: str, hostname: str) -> str:
+    """Serialize the rarely-changing node identity once per node"""
+    return _dumps({'agent_id': agent_id, 'role': role, 'hostname': hostname})
+
+def _history_value(entry: Dict, key: str) -> float:
+    """Metric value from a history entry, reading a nested 'metrics' dict if present"""
+    value = entry.get(key)
+    if value is None:
+        value = (entry.get('metrics') or {}).get(key)
+    return np.nan if value is None else float(value)
+
+def _metric_zscores(current: Dict, historical_data: List[Dict]) -> Dict:
+    """Baseline mean/std per metric across the whole history and the current z-score"""
+    if not historical_data:
+        return {}
+
+    # (T, F) matrix, NaN where an entry lacks the metric
+    hist = np.array(
+        [[_history_value(entry, key) for key in PREDICTION_STAT_FIELDS] for entry in historical_data],
+        dtype=np.float64
+    )
+    present = ~np.isnan(hist)
+    counts = present.sum(axis=0)
+    filled = np.where(present, hist, 0.0)
+    mean = np.divide(filled.sum(axis=0), counts, out=np.full(counts.shape, np.nan), where=counts > 0)
+    sq_dev = np.where(present, (hist - mean) ** 2, 0.0)
+    std = np.sqrt(np.divide(sq_dev.sum(axis=0), counts, out=np.zeros(counts.shape), where=counts > 0))
+
+    cur = np.array([_history_value(current, key) for key in PREDICTION_STAT_FIELDS], dtype=np.float64)
+    z = np.divide(cur - mean, std, out=np.zeros(cur.shape), where=std > 0)
+
+    stats = {}
+    for i, key in enumerate(PREDICTION_STAT_FIELDS):
+        if counts[i] and not np.isnan(cur[i]):
+            stats[key] = {
+                'mean': round(float(mean[i]), 2),
+                'std': round(float(std[i]), 2),
+                'z': round(float(z[i]), 2)
+            }
+    return stats
+
+def _history_tail(historical_data: List[Dict], limit: int = PREDICTION_TAIL_LIMIT) -> List[list]:
+    """Latest samples, oldest first, as [timestamp, cpu, memory, disk] rows"""
+    # Callers pass Mongo results newest first; order explicitly rather than rely on it
+    recent = sorted(historical_data, key=lambda entry: str(entry.get('timestamp', '')))[-limit:]
+    rows = []
+    for entry in recent:
+        row = [entry.get('timestamp')]
+        for key in PREDICTION_STAT_FIELDS:
+            value = _history_value(entry, key)
+            row.append(None if np.isnan(value) else round(value, 1))
+        rows.append(row)
+    return rows
+
+def _round_metric(value, digits: int = 0):
+    """Round a numeric metric for cache keys; non-numeric values pass through"""
+    if isinstance(value, (int, float)):
+        return round(value, digits)
+    if isinstance(value, (list, tuple)):
+        return [_round_metric(item, digits) for item in value]
+    return value
+
+def _health_cache_inputs(node_data: Dict) -> Dict:
+    """Normalized health prompt inputs used as the cache key
+    
+    Drops last_seen (it changes every heartbeat), rounds percentages to whole
+    numbers and sorts anomalies, so a node in steady state maps to one key.
+    """
+    metrics = node_data.get('metrics') or {}
+    return {
+        'agent_id': node_data.get('agent_id'),
+        'hostname': node_data.get('hostname'),
+        'role': node_data.get('role'),
+        'status': node_data.get('status'),
+        'metrics': {
+            'cpu_percent': _round_metric(metrics.get('cpu_percent')),
+            'memory_percent': _round_metric(metrics.get('memory_percent')),
+            'disk_percent': _round_metric(metrics.get('disk_percent')),
+            'network_connections': metrics.get('network_connections'),
+            'load_average': _round_metric(metrics.get('load_average'), 1)
+        },
+        'anomalies': sorted(_dumps(anomaly, indent=False) for anomaly in node_data.get('anomalies', [])),
+        'error_logs': node_data.get('error_logs', [])[-PROMPT_ERROR_LOG_LIMIT:],
+        'health_issues': node_data.get('health_issues', [])
+    }
+
+class NodeMetrics(TypedDict, total=False):
+    """Metrics block of the node data passed to the health analysis prompt"""
+    cpu_percent: float
+    memory_percent: float
+    disk_percent: float
+    network_connections: int
+    load_average: float
+
+HEALTH_SEVERITIES = frozenset(('critical', 'high', 'medium', 'low'))
+
+@dataclass(slots=True, frozen=True)
 class HealthAnalysis:
     """Health analysis result from Gemini AI"""
     severity: str  # critical, high, medium, low
@@ -21,17 +291,43 @@ class HealthAnalysis:
     mirror_recommendation: str
     estimated_recovery_time: int  # minutes
     confidence_score: float
-    immediate_actions: List[str]
-    preventive_measures: List[str]
+    immediate_actions: Tuple[str, ...] = field(default_factory=tuple)
+    preventive_measures: Tuple[str, ...] = field(default_factory=tuple)
+    
+    def __post_init__(self):
+        if self.severity not in HEALTH_SEVERITIES:
+            raise ValueError(f"Invalid severity: {self.severity!r}")
+        if not 0.0 <= self.confidence_score <= 1.0:
+            raise ValueError(f"confidence_score out of range: {self.confidence_score!r}")
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MirrorRecommendation:
     """Mirror node recommendation"""
     should_activate_mirror: bool
     mirror_node_id: str
     transition_strategy: str
+    risk_assessment: str
+    rollback_conditions: Tuple[str, ...] = field(default_factory=tuple)
+
+class HealthAnalysisSchema(BaseModel):
+    """Response schema Gemini must follow for health analyses"""
+    severity: str
+    root_cause: str
+    healing_strategy: str
+    mirror_recommendation: str
+    estimated_recovery_time: int
+    confidence_score: float
+    immediate_actions: List[str]
+    preventive_measures: List[str]
+
+class MirrorRecommendationSchema(BaseModel):
+    """Response schema Gemini must follow for mirror recommendations"""
+    should_activate_mirror: bool
+    mirror_node_id: str
+    transition_strategy: str
     rollback_conditions: List[str]
     risk_assessment: str
+    reasoning: str
 
 class GeminiAIHandler:
     """Enhanced Gemini AI handler for intelligent self-healing"""
@@ -39,6 +335,17 @@ class GeminiAIHandler:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.api_key = os.getenv('GEMINI_API_KEY')
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Caps in-flight Gemini requests so anomaly bursts don't trip rate limits
+        self._inflight = asyncio.Semaphore(int(os.getenv('GEMINI_INFLIGHT', '32')))
+        # Completed analyses per kind, updated off the request path
+        self.analysis_counts: Counter = Counter()
+        self._record_tasks: Set[asyncio.Task] = set()
+        # Response caches per prompt type; repeated heartbeats with unchanged node data skip Gemini
+        self._caches: Dict[str, LLMCache] = {
+            kind: LLMCache(self._build_cache_backend(), ttl=int(os.getenv('LLM_CACHE_TTL', '300')))
+            for kind in ('health', 'mirror', 'strategy', 'prediction')
+        }
         
         if not self.api_key:
             self.logger.warning("GEMINI_API_KEY not found. AI features will be disabled.")
@@ -48,13 +355,145 @@ class GeminiAIHandler:
         try:
             # Configure Gemini 2.0 Flash
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            
+            # Output budgets sized to each response schema; low temperature and a
+            # single candidate keep decoded tokens (and latency) down
+            self.health_cfg = genai.GenerationConfig(
+                response_mime_type='application/json',
+                response_schema=HealthAnalysisSchema,
+                max_output_tokens=512,
+                temperature=0.2,
+                candidate_count=1
+            )
+            self.mirror_cfg = genai.GenerationConfig(
+                response_mime_type='application/json',
+                response_schema=MirrorRecommendationSchema,
+                max_output_tokens=512,
+                temperature=0.2,
+                candidate_count=1
+            )
+            self.strategy_cfg = genai.GenerationConfig(
+                response_mime_type='application/json',
+                max_output_tokens=1024,
+                temperature=0.2,
+                candidate_count=1
+            )
+            self.prediction_cfg = genai.GenerationConfig(
+                response_mime_type='application/json',
+                max_output_tokens=512,
+                temperature=0.2,
+                candidate_count=1
+            )
+            # Connectivity probe only needs "OK" back
+            self.ping_cfg = genai.GenerationConfig(
+                max_output_tokens=10,
+                temperature=0.1,
+                candidate_count=1
+            )
+            self.model = genai.GenerativeModel(GEMINI_MODEL_NAME, generation_config=self.ping_cfg)
+            
+            # One model per prompt type, each carrying its fixed preamble as system instruction
+            # and returning JSON only, so responses need no extraction before parsing
+            self.health_model = genai.GenerativeModel(
+                GEMINI_MODEL_NAME, system_instruction=HEALTH_PREAMBLE, generation_config=self.health_cfg
+            )
+            self.mirror_model = genai.GenerativeModel(
+                GEMINI_MODEL_NAME, system_instruction=MIRROR_PREAMBLE, generation_config=self.mirror_cfg
+            )
+            self.strategy_model = genai.GenerativeModel(
+                GEMINI_MODEL_NAME, system_instruction=STRATEGY_PREAMBLE, generation_config=self.strategy_cfg
+            )
+            self.prediction_model = genai.GenerativeModel(
+                GEMINI_MODEL_NAME, system_instruction=PREDICTION_PREAMBLE, generation_config=self.prediction_cfg
+            )
             self.enabled = True
-            self.logger.info("✅ Gemini 2.0 Flash AI initialized successfully")
+            self.logger.info("ai.init.done model=%s", GEMINI_MODEL_NAME)
         except Exception as e:
-            self.logger.error(f"Failed to initialize Gemini AI: {e}")
+            self.logger.error("Failed to initialize Gemini AI: %s", e)
             self.enabled = False
     
+    async def _generate_content(self, prompt: str, model=None):
+        """Issue a Gemini request through the SDK's native async client"""
+        model = model or self.model
+        async with self._inflight:
+            generate_async = getattr(model, 'generate_content_async', None)
+            if generate_async is not None:
+                return await generate_async(prompt)
+            # SDK builds without the async client fall back to the dedicated executor
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), model.generate_content, prompt)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Bounded pool for blocking Gemini calls, kept off the loop's default executor"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv('GEMINI_POOL', '16')),
+                thread_name_prefix='gemini'
+            )
+        return self._executor
+    
+    def _dispatch_record(self, kind: str, agent_id: Optional[str], outcome: Any):
+        """Schedule result logging/telemetry without delaying the caller"""
+        task = asyncio.create_task(self._record_analysis(kind, agent_id, outcome))
+        self._record_tasks.add(task)
+        task.add_done_callback(self._record_tasks.discard)
+    
+    async def _record_analysis(self, kind: str, agent_id: Optional[str], outcome: Any):
+        """Log a completed AI analysis and update counters"""
+        self.analysis_counts[kind] += 1
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if kind == 'health':
+            self.logger.info("ai.health.done agent=%s severity=%s", agent_id, outcome,
+                             extra={'agent': agent_id, 'severity': outcome})
+        elif kind == 'mirror':
+            self.logger.info("ai.mirror.done agent=%s activate=%s", agent_id, outcome,
+                             extra={'agent': agent_id, 'activate': outcome})
+        elif kind == 'strategy':
+            self.logger.info("ai.strategy.done agent=%s", agent_id, extra={'agent': agent_id})
+        elif kind == 'prediction':
+            self.logger.info("ai.prediction.done agent=%s risk=%s", agent_id, outcome,
+                             extra={'agent': agent_id, 'risk': outcome})
+    
+    def _build_cache_backend(self):
+        """Use Redis when configured, otherwise an in-process LFU cache"""
+        redis_url = os.getenv('LLM_CACHE_REDIS_URL')
+        if redis_url:
+            try:
+                return RedisCacheBackend(redis_url)
+            except ImportError as e:
+                self.logger.warning("Redis LLM cache unavailable, using in-memory cache: %s", e)
+        return InMemoryCacheBackend(max_entries=50000)
+    
+    async def _generate_cached(self, kind: str, prompt: str, model, key_inputs: Optional[Dict] = None) -> str:
+        """Return Gemini's response text for a prompt, serving repeats from cache
+        
+        key_inputs, when given, is a normalized form of the prompt inputs and
+        replaces the rendered prompt in the cache key.
+        """
+        cache = self._caches[kind]
+        key_text = prompt if key_inputs is None else _dumps(key_inputs, indent=False)
+        key = LLMCache.make_key(model.model_name, key_text)
+        
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response = await self._generate_content(prompt, model)
+        text = response.text
+        await cache.set(key, text)
+        return text
+    
+    def get_stats(self) -> Dict:
+        """Cache hit/miss statistics per prompt type"""
+        return {kind: cache.get_stats() for kind, cache in self._caches.items()}
+    
+    def shutdown(self):
+        """Release the Gemini executor threads"""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
     async def analyze_node_health(self, node_data: Dict) -> HealthAnalysis:
         """Analyze node health using Gemini AI and recommend healing actions"""
         if not self.enabled:
@@ -64,20 +503,27 @@ class GeminiAIHandler:
             prompt = self._build_health_analysis_prompt(node_data)
             
             # Generate analysis using Gemini 2.0 Flash
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
+            response_text = await self._generate_cached(
+                'health', prompt, self.health_model, _health_cache_inputs(node_data)
             )
             
             # Parse AI response
-            analysis = self._parse_health_analysis(response.text, node_data)
+            analysis = self._parse_health_analysis(response_text, node_data)
             
-            self.logger.info(f"🧠 AI health analysis completed for {node_data.get('agent_id')}: {analysis.severity}")
+            self._dispatch_record('health', node_data.get('agent_id'), analysis.severity)
             return analysis
             
         except Exception as e:
-            self.logger.error(f"AI health analysis failed: {e}")
+            self.logger.error("AI health analysis failed: %s", e)
             return self._fallback_health_analysis(node_data)
     
+    async def analyze_nodes_health(self, nodes: List[Dict]) -> List[HealthAnalysis]:
+        """Analyze a batch of nodes, scoring the whole batch at once when AI is unavailable"""
+        if not self.enabled:
+            return self._fallback_health_analysis_batch(nodes)
+        
+        return list(await asyncio.gather(*(self.analyze_node_health(node) for node in nodes)))
+    
     async def get_mirror_recommendation(self, node_data: Dict, available_mirrors: List[Dict]) -> MirrorRecommendation:
         """Get intelligent mirror activation recommendation"""
         if not self.enabled:
@@ -86,17 +532,15 @@ class GeminiAIHandler:
         try:
             prompt = self._build_mirror_recommendation_prompt(node_data, available_mirrors)
             
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response_text = await self._generate_cached('mirror', prompt, self.mirror_model)
             
-            recommendation = self._parse_mirror_recommendation(response.text, available_mirrors)
+            recommendation = self._parse_mirror_recommendation(response_text, available_mirrors)
             
-            self.logger.info(f"🔍 AI mirror recommendation for {node_data.get('agent_id')}: {'Activate' if recommendation.should_activate_mirror else 'Keep original'}")
+            self._dispatch_record('mirror', node_data.get('agent_id'), recommendation.should_activate_mirror)
             return recommendation
             
         except Exception as e:
-            self.logger.error(f"AI mirror recommendation failed: {e}")
+            self.logger.error("AI mirror recommendation failed: %s", e)
             return self._fallback_mirror_recommendation(node_data, available_mirrors)
     
     async def generate_healing_strategy(self, node_data: Dict, health_analysis: HealthAnalysis) -> Dict:
@@ -107,17 +551,15 @@ class GeminiAIHandler:
         try:
             prompt = self._build_healing_strategy_prompt(node_data, health_analysis)
             
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response_text = await self._generate_cached('strategy', prompt, self.strategy_model)
             
-            strategy = self._parse_healing_strategy(response.text)
+            strategy = self._parse_healing_strategy(response_text)
             
-            self.logger.info(f"🛠️ AI healing strategy generated for {node_data.get('agent_id')}")
+            self._dispatch_record('strategy', node_data.get('agent_id'), None)
             return strategy
             
         except Exception as e:
-            self.logger.error(f"AI healing strategy generation failed: {e}")
+            self.logger.error("AI healing strategy generation failed: %s", e)
             return self._fallback_healing_strategy(health_analysis)
     
     async def predict_failure_risk(self, node_data: Dict, historical_data: List[Dict]) -> Dict:
@@ -128,24 +570,40 @@ class GeminiAIHandler:
         try:
             prompt = self._build_failure_prediction_prompt(node_data, historical_data)
             
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
-            )
+            response_text = await self._generate_cached('prediction', prompt, self.prediction_model)
             
-            prediction = self._parse_failure_prediction(response.text)
+            prediction = self._parse_failure_prediction(response_text)
             
-            self.logger.info(f"📊 AI failure prediction for {node_data.get('agent_id')}: {prediction.get('risk_level')}")
+            self._dispatch_record('prediction', node_data.get('agent_id'), prediction.get('risk_level'))
             return prediction
             
         except Exception as e:
-            self.logger.error(f"AI failure prediction failed: {e}")
+            self.logger.error("AI failure prediction failed: %s", e)
             return {"risk_level": "unknown", "confidence": 0.0}
     
+    async def full_node_diagnosis(self, node_data: Dict, available_mirrors: List[Dict], historical_data: List[Dict]) -> Dict:
+        """Run all four analyses for a node, overlapping the independent Gemini calls"""
+        health_analysis, prediction = await asyncio.gather(
+            self.analyze_node_health(node_data),
+            self.predict_failure_risk(node_data, historical_data)
+        )
+        recommendation, strategy = await asyncio.gather(
+            self.get_mirror_recommendation(node_data, available_mirrors),
+            self.generate_healing_strategy(node_data, health_analysis)
+        )
+        
+        return {
+            "health_analysis": health_analysis,
+            "failure_prediction": prediction,
+            "mirror_recommendation": recommendation,
+            "healing_strategy": strategy
+        }
+    
     def _build_health_analysis_prompt(self, node_data: Dict) -> str:
-        """Build comprehensive health analysis prompt for Gemini"""
-        return f"""
-        You are an expert system administrator analyzing the health of a network monitoring agent.
+        """Build the per-node section of the health analysis prompt"""
+        metrics: NodeMetrics = node_data.get('metrics') or {}
         
+        return f"""
         AGENT INFORMATION:
         - Agent ID: {node_data.get('agent_id', 'unknown')}
         - Hostname: {node_data.get('hostname', 'unknown')}
@@ -154,147 +612,75 @@ class GeminiAIHandler:
         - Last Seen: {node_data.get('last_seen', 'unknown')}
         
         CURRENT METRICS:
-        - CPU Usage: {node_data.get('metrics', {}).get('cpu_percent', 'N/A')}%
-        - Memory Usage: {node_data.get('metrics', {}).get('memory_percent', 'N/A')}%
-        - Disk Usage: {node_data.get('metrics', {}).get('disk_percent', 'N/A')}%
-        - Network Connections: {node_data.get('metrics', {}).get('network_connections', 'N/A')}
-        - Load Average: {node_data.get('metrics', {}).get('load_average', 'N/A')}
+        - CPU Usage: {metrics.get('cpu_percent', 'N/A')}%
+        - Memory Usage: {metrics.get('memory_percent', 'N/A')}%
+        - Disk Usage: {metrics.get('disk_percent', 'N/A')}%
+        - Network Connections: {metrics.get('network_connections', 'N/A')}
+        - Load Average: {metrics.get('load_average', 'N/A')}
         
         ANOMALIES DETECTED:
-        {json.dumps(node_data.get('anomalies', []), indent=2)}
+        {_dumps(node_data.get('anomalies', []))}
         
-        ERROR LOGS:
-        {json.dumps(node_data.get('error_logs', []), indent=2)}
+        ERROR LOGS (most recent):
+        {_dumps(node_data.get('error_logs', [])[-PROMPT_ERROR_LOG_LIMIT:])}
         
         HEALTH ISSUES:
-        {json.dumps(node_data.get('health_issues', []), indent=2)}
-        
-        Please provide a comprehensive health analysis in the following JSON format:
-        {{
-            "severity": "critical|high|medium|low",
-            "root_cause": "detailed explanation of the primary issue",
-            "healing_strategy": "recommended healing approach",
-            "mirror_recommendation": "should_activate|attempt_heal|monitor_closely",
-            "estimated_recovery_time": minutes_as_integer,
-            "confidence_score": 0.0_to_1.0,
-            "immediate_actions": ["action1", "action2", "action3"],
-            "preventive_measures": ["measure1", "measure2", "measure3"]
-        }}
-        
-        Consider the following in your analysis:
-        1. Resource utilization patterns
-        2. Error frequency and severity
-        3. Network connectivity issues
-        4. Historical performance trends
-        5. Critical service dependencies
-        6. Recovery complexity and time requirements
+        {_dumps(node_data.get('health_issues', []))}
         """
     
     def _build_mirror_recommendation_prompt(self, node_data: Dict, available_mirrors: List[Dict]) -> str:
-        """Build mirror activation recommendation prompt"""
+        """Build the per-node section of the mirror activation prompt"""
         return f"""
-        You are an expert in distributed systems and high availability architectures.
-        
         PRIMARY NODE STATUS:
         - Agent ID: {node_data.get('agent_id')}
         - Current Health: {node_data.get('health_status', 'unknown')}
-        - Critical Issues: {json.dumps(node_data.get('critical_issues', []))}
+        - Critical Issues: {_dumps(node_data.get('critical_issues', []), indent=False)}
         - Recovery Estimate: {node_data.get('recovery_estimate', 'unknown')} minutes
         
         AVAILABLE MIRROR NODES:
-        {json.dumps(available_mirrors, indent=2)}
+        {_dumps(available_mirrors)}
         
         MIRROR RELATIONSHIPS:
-        {json.dumps(node_data.get('mirror_relationships', []), indent=2)}
-        
-        Please analyze whether to activate a mirror node and provide recommendation in JSON format:
-        {{
-            "should_activate_mirror": true/false,
-            "mirror_node_id": "best_mirror_candidate_or_null",
-            "transition_strategy": "immediate|gradual|conditional",
-            "rollback_conditions": ["condition1", "condition2"],
-            "risk_assessment": "low|medium|high",
-            "reasoning": "detailed explanation"
-        }}
-        
-        Consider:
-        1. Primary node recovery probability and time
-        2. Mirror node readiness and capacity
-        3. Service continuity requirements
-        4. Data consistency implications
-        5. Performance impact during transition
-        6. Risk of cascade failures
+        {_dumps(node_data.get('mirror_relationships', []))}
         """
     
     def _build_healing_strategy_prompt(self, node_data: Dict, health_analysis: HealthAnalysis) -> str:
-        """Build detailed healing strategy prompt"""
+        """Build the per-node section of the healing strategy prompt"""
         return f"""
-        You are an expert system administrator creating a detailed healing strategy.
-        
         NODE: {node_data.get('agent_id')}
-        HEALTH ANALYSIS: {health_analysis.__dict__}
-        
-        Create a comprehensive healing strategy with step-by-step actions in JSON format:
-        {{
-            "strategy_id": "unique_identifier",
-            "priority": "immediate|urgent|normal|low",
-            "phases": [
-                {{
-                    "phase": "immediate_stabilization",
-                    "actions": ["action1", "action2"],
-                    "expected_duration": minutes,
-                    "success_criteria": ["criteria1", "criteria2"]
-                }},
-                {{
-                    "phase": "root_cause_resolution", 
-                    "actions": ["action1", "action2"],
-                    "expected_duration": minutes,
-                    "success_criteria": ["criteria1", "criteria2"]
-                }},
-                {{
-                    "phase": "system_optimization",
-                    "actions": ["action1", "action2"], 
-                    "expected_duration": minutes,
-                    "success_criteria": ["criteria1", "criteria2"]
-                }}
-            ],
-            "monitoring_points": ["metric1", "metric2"],
-            "rollback_triggers": ["trigger1", "trigger2"],
-            "estimated_total_time": total_minutes
-        }}
+        HEALTH ANALYSIS: {asdict(health_analysis)}
         """
     
     def _build_failure_prediction_prompt(self, node_data: Dict, historical_data: List[Dict]) -> str:
-        """Build failure prediction prompt"""
+        """Build the per-node section of the failure prediction prompt"""
+        node_identity = _node_static_section(
+            str(node_data.get('agent_id', 'unknown')),
+            str(node_data.get('role', 'unknown')),
+            str(node_data.get('hostname', 'unknown'))
+        )
+        node_state = _project(node_data)
+        zscores = _metric_zscores(node_data, historical_data)
+        tail = _history_tail(historical_data)
+        
         return f"""
-        You are an expert in predictive analytics for distributed systems.
+        NODE:
+        {node_identity}
         
         CURRENT NODE STATE:
-        {json.dumps(node_data, indent=2)}
+        {_dumps(node_state)}
         
-        HISTORICAL DATA (last 10 events):
-        {json.dumps(historical_data[-10:], indent=2)}
+        CURRENT METRICS VS HISTORY ({len(historical_data)} samples, z = standard deviations from mean):
+        {_dumps(zscores)}
         
-        Analyze patterns and predict failure risk in JSON format:
-        {{
-            "risk_level": "critical|high|medium|low",
-            "confidence": 0.0_to_1.0,
-            "time_to_failure": "estimated_hours_or_null",
-            "failure_indicators": ["indicator1", "indicator2"],
-            "trending_metrics": ["metric1_direction", "metric2_direction"],
-            "recommended_actions": ["action1", "action2"]
-        }}
+        RECENT SAMPLES (oldest first; timestamp, {", ".join(PREDICTION_STAT_FIELDS)}):
+        {_dumps(tail, indent=False)}
         """
     
     def _parse_health_analysis(self, ai_response: str, node_data: Dict) -> HealthAnalysis:
         """Parse AI response into HealthAnalysis object"""
         try:
-            # Extract JSON from AI response
-            json_start = ai_response.find('{')
-            json_end = ai_response.rfind('}') + 1
-            json_str = ai_response[json_start:json_end]
-            
-            data = json.loads(json_str)
+            # Structured output mode returns the JSON object directly
+            data = _loads(ai_response)
             
             return HealthAnalysis(
                 severity=data.get('severity', 'medium'),
@@ -303,59 +689,47 @@ class GeminiAIHandler:
                 mirror_recommendation=data.get('mirror_recommendation', 'monitor_closely'),
                 estimated_recovery_time=data.get('estimated_recovery_time', 30),
                 confidence_score=data.get('confidence_score', 0.7),
-                immediate_actions=data.get('immediate_actions', ['Monitor system', 'Check logs']),
-                preventive_measures=data.get('preventive_measures', ['Regular health checks'])
+                immediate_actions=tuple(data.get('immediate_actions', ('Monitor system', 'Check logs'))),
+                preventive_measures=tuple(data.get('preventive_measures', ('Regular health checks',)))
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to parse AI health analysis: {e}")
+            self.logger.error("Failed to parse AI health analysis: %s", e)
             return self._fallback_health_analysis(node_data)
     
     def _parse_mirror_recommendation(self, ai_response: str, available_mirrors: List[Dict]) -> MirrorRecommendation:
         """Parse AI response into MirrorRecommendation object"""
         try:
-            json_start = ai_response.find('{')
-            json_end = ai_response.rfind('}') + 1
-            json_str = ai_response[json_start:json_end]
-            
-            data = json.loads(json_str)
+            data = _loads(ai_response)
             
             return MirrorRecommendation(
                 should_activate_mirror=data.get('should_activate_mirror', False),
                 mirror_node_id=data.get('mirror_node_id', ''),
                 transition_strategy=data.get('transition_strategy', 'gradual'),
-                rollback_conditions=data.get('rollback_conditions', ['Primary node recovery']),
+                rollback_conditions=tuple(data.get('rollback_conditions', ('Primary node recovery',))),
                 risk_assessment=data.get('risk_assessment', 'medium')
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to parse AI mirror recommendation: {e}")
+            self.logger.error("Failed to parse AI mirror recommendation: %s", e)
             return self._fallback_mirror_recommendation({}, available_mirrors)
     
     def _parse_healing_strategy(self, ai_response: str) -> Dict:
         """Parse AI response into healing strategy"""
         try:
-            json_start = ai_response.find('{')
-            json_end = ai_response.rfind('}') + 1
-            json_str = ai_response[json_start:json_end]
-            
-            return json.loads(json_str)
+            return _loads(ai_response)
             
         except Exception as e:
-            self.logger.error(f"Failed to parse AI healing strategy: {e}")
+            self.logger.error("Failed to parse AI healing strategy: %s", e)
             return self._fallback_healing_strategy(None)
     
     def _parse_failure_prediction(self, ai_response: str) -> Dict:
         """Parse AI response into failure prediction"""
         try:
-            json_start = ai_response.find('{')
-            json_end = ai_response.rfind('}') + 1
-            json_str = ai_response[json_start:json_end]
-            
-            return json.loads(json_str)
+            return _loads(ai_response)
             
         except Exception as e:
-            self.logger.error(f"Failed to parse AI failure prediction: {e}")
+            self.logger.error("Failed to parse AI failure prediction: %s", e)
             return {"risk_level": "unknown", "confidence": 0.0}
     
     def _fallback_health_analysis(self, node_data: Dict) -> HealthAnalysis:
@@ -365,24 +739,39 @@ class GeminiAIHandler:
         memory = metrics.get('memory_percent', 0)
         
         if cpu > 90 or memory > 90:
-            severity = 'critical'
-            actions = ['Restart services', 'Clear cache', 'Scale resources']
+            level = 0
         elif cpu > 70 or memory > 70:
-            severity = 'high'
-            actions = ['Monitor closely', 'Optimize processes']
+            level = 1
         else:
-            severity = 'medium'
-            actions = ['Regular monitoring']
+            level = 2
         
+        return self._fallback_analysis_for_level(level)
+    
+    def _fallback_health_analysis_batch(self, nodes: List[Dict]) -> List[HealthAnalysis]:
+        """Vectorized fallback health analysis for a batch of nodes"""
+        cpu = np.fromiter(
+            ((n.get('metrics') or {}).get('cpu_percent') or 0 for n in nodes),
+            dtype=np.float32, count=len(nodes)
+        )
+        memory = np.fromiter(
+            ((n.get('metrics') or {}).get('memory_percent') or 0 for n in nodes),
+            dtype=np.float32, count=len(nodes)
+        )
+        levels = _score_severity(cpu, memory)
+        
+        return [self._fallback_analysis_for_level(level) for level in levels.tolist()]
+    
+    def _fallback_analysis_for_level(self, level: int) -> HealthAnalysis:
+        """Build the rule-based analysis for a fallback severity level"""
         return HealthAnalysis(
-            severity=severity,
+            severity=FALLBACK_SEVERITIES[level],
             root_cause='High resource utilization detected',
             healing_strategy='Resource optimization and service restart',
             mirror_recommendation='monitor_closely',
             estimated_recovery_time=15,
             confidence_score=0.6,
-            immediate_actions=actions,
-            preventive_measures=['Resource monitoring', 'Capacity planning']
+            immediate_actions=FALLBACK_ACTIONS[level],
+            preventive_measures=('Resource monitoring', 'Capacity planning')
         )
     
     def _fallback_mirror_recommendation(self, node_data: Dict, available_mirrors: List[Dict]) -> MirrorRecommendation:
@@ -395,7 +784,7 @@ class GeminiAIHandler:
             should_activate_mirror=should_activate,
             mirror_node_id=mirror_id,
             transition_strategy='gradual',
-            rollback_conditions=['Primary node recovery', 'Mirror node failure'],
+            rollback_conditions=('Primary node recovery', 'Mirror node failure'),
             risk_assessment='medium'
         )
     
@@ -429,12 +818,10 @@ class GeminiAIHandler:
             return False
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content, "Hello, respond with 'OK' if you're working."
-            )
+            response = await self._generate_content("Hello, respond with 'OK' if you're working.")
             
             return 'ok' in response.text.lower()
             
         except Exception as e:
-            self.logger.error(f"Gemini AI health check failed: {e}")
+            self.logger.error("Gemini AI health check failed: %s", e)
             return False
@@ -10,9 +10,9 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import google.generativeai as genai
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HealthAnalysis:
     """Health analysis result from Gemini AI"""
     severity: str  # critical, high, medium, low
@@ -24,7 +24,7 @@ class HealthAnalysis:
     immediate_actions: List[str]
     preventive_measures: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MirrorRecommendation:
     """Mirror node recommendation"""
     should_activate_mirror: bool
@@ -232,7 +232,7 @@ class GeminiAIHandler:
         You are an expert system administrator creating a detailed healing strategy.
         
         NODE: {node_data.get('agent_id')}
-        HEALTH ANALYSIS: {health_analysis.__dict__}
+        HEALTH ANALYSIS: {asdict(health_analysis)}
         
         Create a comprehensive healing strategy with step-by-step actions in JSON format:
         {{
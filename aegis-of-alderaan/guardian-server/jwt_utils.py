@@ -5,46 +5,72 @@ JWT token management for Guardian server
 
 import jwt
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 import os
 
+# Claims set by generate_token; stripped before re-issuing a token
+_JWT_RESERVED = frozenset({'iat', 'exp', 'iss', 'type'})
+
 class JWTManager:
     def __init__(self, secret_key: str = None, algorithm: str = 'HS256'):
         self.secret_key = secret_key or os.getenv('JWT_SECRET_KEY') or os.getenv('JWT_SECRET', 'aegis-guardian-secret-key')
         self.algorithm = algorithm
+        # Encoded once so PyJWT does not re-encode the key on every sign/verify;
+        # HMAC itself runs in hashlib's OpenSSL backend
+        self._secret_bytes = self.secret_key.encode('utf-8')
+        self._algorithms = [algorithm]
         self.logger = logging.getLogger(__name__)
+
+        # Validated tokens: token -> (exp, payload). Agents reuse a token until it
+        # expires, so repeat validations skip decode and signature checks.
+        self._token_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._token_cache_lock = threading.Lock()
+        self._token_cache_sweep_every = 1024
+        self._token_cache_inserts = 0
         
     def generate_token(self, payload: Dict, expires_in: int = 3600) -> str:
         """Generate JWT token for agents"""
         try:
-            now = datetime.utcnow()
-            exp_time = now + timedelta(seconds=expires_in)
+            now = time.time()
             
             token_payload = {
                 **payload,
-                'iat': int(now.timestamp()),
-                'exp': int(exp_time.timestamp()),
+                'iat': int(now),
+                'exp': int(now + expires_in),
                 'iss': 'aegis-guardian',
                 'type': 'agent_auth'
             }
             
-            self.logger.debug(f"Generating token with expiry: {exp_time} (in {expires_in} seconds)")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Generating token with expiry: %s (in %s seconds)",
+                                  datetime.fromtimestamp(now + expires_in), expires_in)
             
-            token = jwt.encode(token_payload, self.secret_key, algorithm=self.algorithm)
-            self.logger.debug(f"Generated token for agent: {payload.get('agent_id', 'unknown')}")
+            token = jwt.encode(token_payload, self._secret_bytes, algorithm=self.algorithm)
+            self.logger.debug("Generated token for agent: %s", payload.get('agent_id', 'unknown'))
             
             return token
             
         except Exception as e:
-            self.logger.error(f"Token generation failed: {e}")
+            self.logger.error("Token generation failed: %s", e)
             raise
     
     def validate_token(self, token: str) -> Optional[Dict]:
         """Validate JWT token"""
+        with self._token_cache_lock:
+            cached = self._token_cache.get(token)
+        if cached is not None:
+            exp, payload = cached
+            if time.time() < exp:
+                return dict(payload)
+            with self._token_cache_lock:
+                self._token_cache.pop(token, None)
+
         try:
             # Decode with detailed error handling
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = jwt.decode(token, self._secret_bytes, algorithms=self._algorithms)
             
             # Check token type
             if payload.get('type') != 'agent_auth':
@@ -52,13 +78,15 @@ class JWTManager:
                 return None
             
             # Log token details for debugging
-            now = datetime.utcnow()
             exp_timestamp = payload.get('exp', 0)
-            exp_time = datetime.fromtimestamp(exp_timestamp) if exp_timestamp else None
-            
-            self.logger.debug(f"Token validation - Current time: {now}, Expires: {exp_time}")
-            self.logger.debug(f"Token validated for agent: {payload.get('agent_id', 'unknown')}")
-            return payload
+            if self.logger.isEnabledFor(logging.DEBUG):
+                exp_time = datetime.fromtimestamp(exp_timestamp) if exp_timestamp else None
+                self.logger.debug("Token validation - Current time: %s, Expires: %s", datetime.now(), exp_time)
+                self.logger.debug("Token validated for agent: %s", payload.get('agent_id', 'unknown'))
+
+            if exp_timestamp:
+                self._cache_token(token, exp_timestamp, payload)
+            return dict(payload)
             
         except jwt.ExpiredSignatureError:
             # Get more details about the expiration
@@ -67,28 +95,38 @@ class JWTManager:
                 unverified = jwt.decode(token, options={"verify_signature": False})
                 exp_time = datetime.fromtimestamp(unverified.get('exp', 0))
                 now = datetime.utcnow()
-                self.logger.warning(f"Token has expired - Expired at: {exp_time}, Current time: {now}")
+                self.logger.warning("Token has expired - Expired at: %s, Current time: %s", exp_time, now)
             except:
                 self.logger.warning("Token has expired")
             return None
         except jwt.InvalidTokenError as e:
-            self.logger.warning(f"Invalid token: {e}")
+            self.logger.warning("Invalid token: %s", e)
             return None
         except Exception as e:
-            self.logger.error(f"Token validation error: {e}")
+            self.logger.error("Token validation error: %s", e)
             return None
     
+    def _cache_token(self, token: str, exp: float, payload: Dict):
+        """Remember a validated token until it expires"""
+        with self._token_cache_lock:
+            self._token_cache[token] = (exp, payload)
+            self._token_cache_inserts += 1
+            if self._token_cache_inserts % self._token_cache_sweep_every == 0:
+                now = time.time()
+                expired = [t for t, (t_exp, _) in self._token_cache.items() if t_exp <= now]
+                for t in expired:
+                    del self._token_cache[t]
+    
     def refresh_token(self, token: str, expires_in: int = 3600) -> Optional[str]:
         """Refresh an existing token"""
         payload = self.validate_token(token)
         if not payload:
             return None
         
-        # Remove JWT claims to avoid conflicts
-        for claim in ['iat', 'exp', 'iss', 'type']:
-            payload.pop(claim, None)
+        # Carry over only the agent claims; generate_token sets the JWT ones
+        claims = {k: v for k, v in payload.items() if k not in _JWT_RESERVED}
         
-        return self.generate_token(payload, expires_in)
+        return self.generate_token(claims, expires_in)
     
     def extract_agent_info(self, token: str) -> Optional[Dict]:
         """Extract agent information from token"""
@@ -110,8 +148,7 @@ class JWTManager:
             exp = payload.get('exp')
             
             if exp:
-                exp_datetime = datetime.fromtimestamp(exp)
-                return datetime.utcnow() > exp_datetime
+                return time.time() > exp
             
             return True
             
@@ -123,5 +160,5 @@ class JWTManager:
         try:
             return jwt.decode(token, options={"verify_signature": False})
         except Exception as e:
-            self.logger.error(f"Failed to decode token: {e}")
+            self.logger.error("Failed to decode token: %s", e)
             return None
@@ -0,0 +1,126 @@
+"""
+Aegis of Alderaan - LLM Response Cache
+Caches Gemini responses keyed on a digest of the model and prompt
+"""
+
+import hashlib
+import heapq
+import logging
+import time
+from typing import Dict, Optional, Protocol, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+class CacheBackend(Protocol):
+    """Storage interface used by LLMCache"""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+class InMemoryCacheBackend:
+    """In-process cache with TTL expiry and LFU eviction"""
+
+    def __init__(self, max_entries: int = 50000, evict_fraction: float = 0.1):
+        self.max_entries = max_entries
+        self.evict_count = max(1, int(max_entries * evict_fraction))
+        # key -> (expires_at, value, hit_count)
+        self._entries: Dict[str, Tuple[float, str, int]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, hits = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries[key] = (expires_at, value, hits + 1)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict()
+        self._entries[key] = (time.monotonic() + ttl, value, 0)
+
+    def _evict(self):
+        """Drop expired entries, then the least frequently used batch if still full"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+        if len(self._entries) >= self.max_entries:
+            coldest = heapq.nsmallest(
+                self.evict_count, self._entries.items(), key=lambda item: item[1][2]
+            )
+            for key, _ in coldest:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class RedisCacheBackend:
+    """Redis-backed cache shared between guardian processes"""
+
+    def __init__(self, url: str, prefix: str = 'aegis:llm:'):
+        if aioredis is None:
+            raise ImportError("redis package is required for RedisCacheBackend")
+        self.client = aioredis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+class LLMCache:
+    """Exact-match response cache with hit/miss accounting"""
+
+    def __init__(self, backend: CacheBackend = None, ttl: int = 300):
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.ttl = ttl
+        self.stats = {'hits': 0, 'misses': 0}
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Digest of the request inputs, hashed directly without a JSON round-trip"""
+        digest = hashlib.sha256(model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.logger.warning(f"LLM cache lookup failed: {e}")
+            value = None
+
+        if value is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: int = None):
+        try:
+            await self.backend.set(key, value, ttl or self.ttl)
+        except Exception as e:
+            self.logger.warning(f"LLM cache store failed: {e}")
+
+    def get_stats(self) -> Dict:
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / total if total else 0.0
+        }
@@ -3,7 +3,7 @@ Aegis of Alderaan - Agent Models
 Pydantic models for agent data structures
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -16,8 +16,8 @@ class AgentModel(BaseModel):
     capabilities: List[str] = Field(default=[], description="Agent capabilities")
     last_heartbeat: Optional[datetime] = Field(None, description="Last heartbeat timestamp")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "agent_id": "laptop-001-agent",
                 "hostname": "laptop-001",
@@ -27,14 +27,15 @@ class AgentModel(BaseModel):
                 "last_heartbeat": "2025-07-17T10:30:00Z"
             }
         }
+    )
 
 class AgentCommand(BaseModel):
     """Command to send to agent"""
     command: str = Field(..., description="Command to execute")
     parameters: Dict[str, Any] = Field(default={}, description="Command parameters")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "command": "restart_service",
                 "parameters": {
@@ -43,6 +44,7 @@ class AgentCommand(BaseModel):
                 }
             }
         }
+    )
 
 class AgentStatus(BaseModel):
     """Agent status response"""
@@ -3,7 +3,7 @@ Aegis of Alderaan - Authentication Models
 Pydantic models for authentication and authorization
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -13,14 +13,15 @@ class AuthModel(BaseModel):
     hostname: str = Field(..., description="Agent hostname")
     role: str = Field(default="endpoint", description="Agent role")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "agent_id": "laptop-001-agent",
                 "hostname": "laptop-001",
                 "role": "endpoint"
             }
         }
+    )
 
 class TokenResponse(BaseModel):
     """JWT token response model"""
@@ -3,7 +3,7 @@ Aegis of Alderaan - Metrics Models
 Pydantic models for system metrics and monitoring data
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -46,8 +46,8 @@ class SystemMetrics(BaseModel):
     disk: DiskMetrics = Field(..., description="Disk metrics")
     network: NetworkMetrics = Field(..., description="Network metrics")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "agent_id": "laptop-001-agent",
                 "hostname": "laptop-001",
@@ -79,27 +79,32 @@ class SystemMetrics(BaseModel):
                 }
             }
         }
+    )
 
 # Alias for backward compatibility
 MetricsModel = SystemMetrics
 
 class AnomalyModel(BaseModel):
     """Anomaly detection result model"""
-    agent_id: str = Field(..., description="Agent identifier")
-    type: str = Field(..., description="Anomaly type")
-    severity: str = Field(..., description="Anomaly severity")
-    description: str = Field(..., description="Anomaly description")
-    timestamp: str = Field(..., description="Detection timestamp")
-    current_value: Optional[float] = Field(None, description="Current metric value")
-    threshold: Optional[float] = Field(None, description="Threshold value")
-    context: Dict[str, Any] = Field(default={}, description="Additional context")
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    agent_id: str
+    type: str
+    severity: str
+    description: str
+    timestamp: str  # Detection timestamp
+    current_value: Optional[float] = None
+    threshold: Optional[float] = None
+    context: Dict[str, Any] = {}
 
 class MetricsSummary(BaseModel):
     """Metrics summary for dashboard"""
-    total_agents: int = Field(..., description="Total number of agents")
-    active_agents: int = Field(..., description="Number of active agents")
-    avg_cpu_usage: float = Field(..., description="Average CPU usage across all agents")
-    avg_memory_usage: float = Field(..., description="Average memory usage")
-    avg_disk_usage: float = Field(..., description="Average disk usage")
-    total_anomalies: int = Field(..., description="Total anomalies detected")
-    critical_alerts: int = Field(..., description="Number of critical alerts")
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    total_agents: int
+    active_agents: int
+    avg_cpu_usage: float  # Averaged across all agents
+    avg_memory_usage: float
+    avg_disk_usage: float
+    total_anomalies: int
+    critical_alerts: int
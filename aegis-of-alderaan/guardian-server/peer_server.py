@@ -8,16 +8,50 @@ import asyncio
 import logging
 import json
 import socket
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Optional
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Union
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+import numpy as np
 import psutil
 import uvicorn
 import aiohttp
 from distributed_manager import DistributedManager, PeerInfo
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _json_default(obj):
+    """stdlib fallback encoding matching orjson's OPT_NAIVE_UTC datetimes"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    return str(obj)
+
+def _dumps(obj) -> str:
+    """Serialize a WebSocket message, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC, default=str).decode()
+    return json.dumps(obj, default=_json_default)
+
+def _dumps_bytes(obj) -> bytes:
+    """Serialize an HTTP request body, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC, default=str)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,7 +60,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Aegis Peer Node",
     description="Distributed peer node for Aegis network",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
 )
 
 # Add CORS middleware
@@ -41,67 +76,110 @@ app.add_middleware(
 # Initialize distributed manager as peer
 distributed_manager = DistributedManager(node_role="peer")
 
+@dataclass(slots=True)
+class ConnectionState:
+    """Peer's connection to its Guardian"""
+    node_id: Optional[str]
+    connected: bool = False
+    guardian_host: Optional[str] = None
+    guardian_port: Optional[int] = None
+    last_heartbeat: Optional[datetime] = None
+    health_status: str = "healthy"
+
+    def asdict(self) -> Dict:
+        return asdict(self)
+
 # Connection state
-connection_state = {
-    "connected": False,
-    "guardian_host": None,
-    "guardian_port": None,
-    "node_id": distributed_manager.my_node_id,
-    "last_heartbeat": None,
-    "health_status": "healthy"
-}
-
-# WebSocket connections
-websocket_connections = []
+connection_state = ConnectionState(node_id=distributed_manager.my_node_id)
+
+# Constant envelopes for the two recurring dashboard messages; only the body is encoded per send
+_CONN_STATUS_PREFIX = '{"type":"connection_status","status":'
+_METRICS_PREFIX = '{"type":"metrics_update","metrics":'
+
+# Encoded connection state, refreshed on every change so broadcasts never re-encode it
+_conn_state_json = _dumps(connection_state.asdict())
+
+def set_connection_state(**fields):
+    """Update connection state fields and refresh the cached encoding"""
+    global _conn_state_json
+    for name, value in fields.items():
+        setattr(connection_state, name, value)
+    _conn_state_json = _dumps(connection_state.asdict())
+
+def _connection_status_message() -> str:
+    """Encoded connection_status message for the current state"""
+    return _CONN_STATUS_PREFIX + _conn_state_json + '}'
+
+def _metrics_update_message(metrics: Dict) -> str:
+    """Encoded metrics_update message"""
+    return _METRICS_PREFIX + _dumps(metrics) + '}'
+
+# WebSocket connections: each client has an outbound queue drained by its own endpoint task
+websocket_queues: Dict[WebSocket, asyncio.Queue] = {}
+# Messages queued within the batch window go out as one JSON array frame
+WS_BATCH_WINDOW = 0.005
+WS_MAX_BATCH = 16
+WS_QUEUE_SIZE = 256
+# How often the sampler considers pushing metrics_update to dashboard clients
+WS_METRICS_PUSH_INTERVAL = 30
 
 @app.websocket("/ws/peer")
 async def peer_websocket(websocket: WebSocket):
     """WebSocket endpoint for peer dashboard"""
     await websocket.accept()
-    websocket_connections.append(websocket)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+    websocket_queues[websocket] = queue
     
     try:
         # Send initial status
-        await websocket.send_text(json.dumps({
-            "type": "connection_status",
-            "status": connection_state
-        }))
+        queue.put_nowait(_connection_status_message())
         
         while True:
-            # Keep connection alive and send periodic updates
-            await asyncio.sleep(30)
+            first = await queue.get()
             
-            # Send metrics update
-            metrics = get_system_metrics()
-            await websocket.send_text(json.dumps({
-                "type": "metrics_update", 
-                "metrics": metrics
-            }))
+            # Give concurrent broadcasts a moment to land in the same frame
+            await asyncio.sleep(WS_BATCH_WINDOW)
+            batch = [first]
+            while len(batch) < WS_MAX_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            await websocket.send_text(batch[0] if len(batch) == 1 else '[' + ','.join(batch) + ']')
             
     except WebSocketDisconnect:
         logger.info("Peer WebSocket disconnected")
-        websocket_connections.remove(websocket)
+    except Exception as e:
+        logger.warning(f"Peer WebSocket closed: {e}")
+    finally:
+        websocket_queues.pop(websocket, None)
 
-async def broadcast_to_websockets(message: Dict):
-    """Broadcast message to all connected WebSocket clients"""
-    disconnected = []
-    for ws in websocket_connections:
+def broadcast_to_websockets(message: Union[Dict, str]):
+    """Queue a message (a dict, or an already encoded string) for all connected WebSocket clients"""
+    payload = message if isinstance(message, str) else _dumps(message)
+    for queue in websocket_queues.values():
         try:
-            await ws.send_text(json.dumps(message))
-        except:
-            disconnected.append(ws)
-    
-    # Remove disconnected websockets
-    for ws in disconnected:
-        websocket_connections.remove(ws)
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Client is not keeping up; it will catch up from the next update
+            pass
 
-def get_system_metrics() -> Dict:
-    """Get current system metrics"""
+# The peer's own process, kept so per-process cpu_percent has a previous sample
+_PROCESS = psutil.Process()
+
+def _sample_system_metrics() -> Dict:
+    """Read current system counters (blocking psutil calls)"""
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Non-blocking: percentage since the previous call, primed at startup
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         network = psutil.net_io_counters()
+        # Per-process fields share one /proc/<pid> read
+        with _PROCESS.oneshot():
+            process = {
+                "cpu_percent": _PROCESS.cpu_percent(interval=None),
+                "memory_rss": _PROCESS.memory_info().rss,
+                "num_threads": _PROCESS.num_threads()
+            }
         
         return {
             "cpu_usage": cpu_percent,
@@ -110,7 +188,8 @@ def get_system_metrics() -> Dict:
             "network_io": {
                 "bytes_sent": network.bytes_sent,
                 "bytes_recv": network.bytes_recv
-            }
+            },
+            "process": process
         }
     except Exception as e:
         logger.error(f"Error getting system metrics: {e}")
@@ -121,11 +200,177 @@ def get_system_metrics() -> Dict:
             "network_io": {
                 "bytes_sent": 0,
                 "bytes_recv": 0
+            },
+            "process": {
+                "cpu_percent": 0.0,
+                "memory_rss": 0,
+                "num_threads": 0
             }
         }
 
-def get_local_ip():
-    """Get local IP address"""
+# Latest sample, refreshed in the background so requests never wait on psutil
+METRICS_SAMPLE_INTERVAL = 5
+_latest_metrics: Dict = {}
+_sampler_task: Optional[asyncio.Task] = None
+
+# Rolling window of cpu/mem/disk/net_rate samples (10 minutes at the sample interval)
+METRICS_WINDOW = 120
+STATS_FIELDS = ("cpu_usage", "memory_usage", "disk_usage", "net_rate")
+_metrics_ring = np.zeros((METRICS_WINDOW, len(STATS_FIELDS)), dtype=np.float32)
+_ring_head = 0
+_ring_count = 0
+_last_net_bytes: Optional[int] = None
+_latest_stats: Dict = {}
+
+def _compute_stats_py(buf, count):
+    """Column mean/std/max over the filled part of the ring"""
+    filled = buf[:count]
+    return filled.mean(axis=0), filled.std(axis=0), filled.max(axis=0)
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _compute_stats(buf, count):
+        """Single pass per column over the filled part of the ring"""
+        cols = buf.shape[1]
+        mean = np.zeros(cols, dtype=np.float32)
+        std = np.zeros(cols, dtype=np.float32)
+        peak = np.zeros(cols, dtype=np.float32)
+        for j in range(cols):
+            total = 0.0
+            sq = 0.0
+            top = buf[0, j]
+            for i in range(count):
+                v = buf[i, j]
+                total += v
+                sq += v * v
+                if v > top:
+                    top = v
+            m = total / count
+            mean[j] = m
+            std[j] = np.sqrt(max(sq / count - m * m, 0.0))
+            peak[j] = top
+        return mean, std, peak
+else:
+    _compute_stats = _compute_stats_py
+
+def _record_sample(metrics: Dict):
+    """Push one sample into the ring and refresh the window stats"""
+    global _ring_head, _ring_count, _last_net_bytes, _latest_stats
+    network = metrics.get("network_io", {})
+    net_bytes = network.get("bytes_sent", 0) + network.get("bytes_recv", 0)
+    # Bytes per second since the previous sample; zero on the first one
+    net_rate = 0.0
+    if _last_net_bytes is not None and net_bytes >= _last_net_bytes:
+        net_rate = (net_bytes - _last_net_bytes) / METRICS_SAMPLE_INTERVAL
+    _last_net_bytes = net_bytes
+    
+    _metrics_ring[_ring_head] = (
+        metrics.get("cpu_usage", 0.0),
+        metrics.get("memory_usage", 0.0),
+        metrics.get("disk_usage", 0.0),
+        net_rate
+    )
+    _ring_head = (_ring_head + 1) % METRICS_WINDOW
+    _ring_count = min(_ring_count + 1, METRICS_WINDOW)
+    
+    # Order within the ring does not matter for these aggregates
+    mean, std, peak = _compute_stats(_metrics_ring, _ring_count)
+    _latest_stats = {
+        "samples": _ring_count,
+        **{
+            field: {
+                "mean": round(float(mean[i]), 2),
+                "std": round(float(std[i]), 2),
+                "max": round(float(peak[i]), 2)
+            }
+            for i, field in enumerate(STATS_FIELDS)
+        }
+    }
+
+async def _metrics_sampler_loop():
+    """Refresh the cached metrics sample off the event loop"""
+    global _latest_metrics
+    last_push = time.monotonic()
+    while True:
+        await asyncio.sleep(METRICS_SAMPLE_INTERVAL)
+        _latest_metrics = await asyncio.to_thread(_sample_system_metrics)
+        _record_sample(_latest_metrics)
+        
+        # One encoded snapshot fans out to all dashboard clients, only when it changed
+        now = time.monotonic()
+        if now - last_push >= WS_METRICS_PUSH_INTERVAL:
+            last_push = now
+            if websocket_queues and _metrics_changed(_latest_metrics):
+                broadcast_to_websockets(_metrics_update_message(_latest_metrics))
+
+@app.on_event("startup")
+async def start_metrics_sampler():
+    """Prime psutil's CPU counter and start the background sampler"""
+    global _latest_metrics, _sampler_task
+    # Even the first /proc sweep runs off the loop
+    await asyncio.to_thread(psutil.cpu_percent, interval=None)
+    await asyncio.to_thread(_PROCESS.cpu_percent, interval=None)
+    _latest_metrics = await asyncio.to_thread(_sample_system_metrics)
+    _record_sample(_latest_metrics)
+    _sampler_task = asyncio.create_task(_metrics_sampler_loop())
+
+@app.on_event("shutdown")
+async def stop_metrics_sampler():
+    """Stop the background sampler"""
+    if _sampler_task:
+        _sampler_task.cancel()
+
+@app.on_event("startup")
+async def open_http_session():
+    """Shared keep-alive session for outbound calls to the Guardian"""
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60)
+    )
+
+@app.on_event("shutdown")
+async def close_http_session():
+    """Close the shared outbound session"""
+    await app.state.http.close()
+
+def get_system_metrics() -> Dict:
+    """Get current system metrics"""
+    return _latest_metrics or _sample_system_metrics()
+
+# Sampler metrics pushes are skipped while the rounded values are unchanged,
+# but still sent at least this often so dashboards stay fresh
+METRICS_FORCE_BROADCAST_INTERVAL = 300
+_last_metrics_hash: Optional[int] = None
+_last_metrics_broadcast = 0.0
+
+def _metrics_changed(metrics: Dict) -> bool:
+    """Whether metrics differ visibly from the last broadcast (or it is due anyway)"""
+    global _last_metrics_hash, _last_metrics_broadcast
+    network = metrics.get("network_io", {})
+    metrics_hash = hash((
+        round(metrics.get("cpu_usage", 0.0), 1),
+        round(metrics.get("memory_usage", 0.0), 1),
+        round(metrics.get("disk_usage", 0.0), 1),
+        network.get("bytes_sent", 0) // 1_000_000,
+        network.get("bytes_recv", 0) // 1_000_000
+    ))
+    now = time.monotonic()
+    if metrics_hash == _last_metrics_hash and now - _last_metrics_broadcast < METRICS_FORCE_BROADCAST_INTERVAL:
+        return False
+    _last_metrics_hash = metrics_hash
+    _last_metrics_broadcast = now
+    return True
+
+def _compute_local_ip():
+    """Determine the local IP address"""
+    # First non-loopback, non-link-local IPv4 interface address
+    try:
+        for addrs in psutil.net_if_addrs().values():
+            for addr in addrs:
+                if addr.family == socket.AF_INET and not addr.address.startswith(('127.', '169.254.')):
+                    return addr.address
+    except Exception as e:
+        logger.warning(f"Interface address lookup failed: {e}")
+    
     try:
         # Connect to a remote address to determine local IP
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
@@ -134,19 +379,43 @@ def get_local_ip():
     except:
         return "127.0.0.1"
 
-@app.get("/peer/status")
+# Host identity is static for the peer's lifetime; resolve it once instead of per request
+HOSTNAME = socket.gethostname()
+LOCAL_IP = _compute_local_ip()
+
+def get_local_ip():
+    """Get local IP address"""
+    return LOCAL_IP
+
+def _json_response(content: Dict) -> Response:
+    """Encode a hot handler's result directly, bypassing FastAPI's jsonable_encoder"""
+    return Response(_dumps_bytes(content), media_type="application/json")
+
+@app.get("/peer/status", response_model=None)
 async def get_peer_status():
     """Get peer node status"""
     metrics = get_system_metrics()
-    return {
-        "connection": connection_state,
+    return _json_response({
+        "connection": connection_state.asdict(),
         "metrics": metrics,
-        "hostname": socket.gethostname(),
-        "ip_address": get_local_ip(),
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "hostname": HOSTNAME,
+        "ip_address": LOCAL_IP,
+        "timestamp": datetime.utcnow()
+    })
+
+@app.post("/peer/refresh-network", response_model=None)
+async def refresh_network():
+    """Re-resolve hostname and local IP after a network change"""
+    global HOSTNAME, LOCAL_IP
+    HOSTNAME = socket.gethostname()
+    LOCAL_IP = _compute_local_ip()
+    return _json_response({
+        "hostname": HOSTNAME,
+        "ip_address": LOCAL_IP,
+        "timestamp": datetime.utcnow()
+    })
 
-@app.post("/peer/connect")
+@app.post("/peer/connect", response_model=None)
 async def connect_to_guardian(request: Dict):
     """Connect this peer to a Guardian node"""
     guardian_host = request.get("guardian_host", "localhost")
@@ -156,8 +425,8 @@ async def connect_to_guardian(request: Dict):
         # Create peer info
         my_info = PeerInfo(
             node_id=distributed_manager.my_node_id,
-            hostname=socket.gethostname(),
-            ip_address=get_local_ip(),
+            hostname=HOSTNAME,
+            ip_address=LOCAL_IP,
             port=3002,  # This peer's port
             role="peer",
             capabilities=["metrics_collection", "self_healing", "mirror_support"],
@@ -171,132 +440,142 @@ async def connect_to_guardian(request: Dict):
         )
         
         if success:
-            connection_state.update({
-                "connected": True,
-                "guardian_host": guardian_host,
-                "guardian_port": guardian_port,
-                "last_heartbeat": datetime.utcnow().isoformat(),
-                "health_status": "healthy"
-            })
+            set_connection_state(
+                connected=True,
+                guardian_host=guardian_host,
+                guardian_port=guardian_port,
+                last_heartbeat=datetime.utcnow(),
+                health_status="healthy"
+            )
             
             # Start heartbeat task
             asyncio.create_task(heartbeat_task(guardian_host, guardian_port))
             
             # Broadcast status update
-            await broadcast_to_websockets({
-                "type": "connection_status",
-                "status": connection_state
-            })
+            broadcast_to_websockets(_connection_status_message())
             
-            return {
+            return _json_response({
                 "success": True,
                 "message": f"Connected to Guardian at {guardian_host}:{guardian_port}",
-                "connection": connection_state
-            }
+                "connection": connection_state.asdict()
+            })
         else:
-            return {
+            return _json_response({
                 "success": False,
                 "message": "Failed to connect to Guardian",
-                "connection": connection_state
-            }
+                "connection": connection_state.asdict()
+            })
             
     except Exception as e:
         logger.error(f"Error connecting to Guardian: {e}")
-        return {
+        return _json_response({
             "success": False,
             "message": f"Error: {str(e)}",
-            "connection": connection_state
-        }
+            "connection": connection_state.asdict()
+        })
 
-@app.post("/peer/disconnect")
+@app.post("/peer/disconnect", response_model=None)
 async def disconnect_from_guardian():
     """Disconnect from Guardian node"""
     try:
-        if connection_state["connected"]:
+        if connection_state.connected:
             # Update connection state
-            connection_state.update({
-                "connected": False,
-                "guardian_host": None,
-                "guardian_port": None,
-                "last_heartbeat": None,
-                "health_status": "disconnected"
-            })
+            set_connection_state(
+                connected=False,
+                guardian_host=None,
+                guardian_port=None,
+                last_heartbeat=None,
+                health_status="disconnected"
+            )
             
             # Broadcast status update
-            await broadcast_to_websockets({
-                "type": "connection_status",
-                "status": connection_state
-            })
+            broadcast_to_websockets(_connection_status_message())
             
-            return {
+            return _json_response({
                 "success": True,
                 "message": "Disconnected from Guardian",
-                "connection": connection_state
-            }
+                "connection": connection_state.asdict()
+            })
         else:
-            return {
+            return _json_response({
                 "success": False,
                 "message": "Not connected to any Guardian",
-                "connection": connection_state
-            }
+                "connection": connection_state.asdict()
+            })
             
     except Exception as e:
         logger.error(f"Error disconnecting from Guardian: {e}")
-        return {
+        return _json_response({
             "success": False,
             "message": f"Error: {str(e)}",
-            "connection": connection_state
-        }
+            "connection": connection_state.asdict()
+        })
+
+# Heartbeat POSTs run as background tasks so the cadence doesn't depend on Guardian latency
+HEARTBEAT_MAX_INFLIGHT = 4
+HEARTBEAT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+_heartbeat_sem = asyncio.Semaphore(HEARTBEAT_MAX_INFLIGHT)
+_heartbeat_tasks: Set[asyncio.Task] = set()
+
+async def _send_heartbeat(url: str, body: bytes):
+    """POST one heartbeat and record the outcome in the connection state"""
+    async with _heartbeat_sem:
+        try:
+            async with app.state.http.post(
+                url,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=HEARTBEAT_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    set_connection_state(last_heartbeat=datetime.utcnow(), health_status="healthy")
+                else:
+                    logger.warning(f"Heartbeat failed with status: {response.status}")
+                    set_connection_state(health_status="warning")
+        except Exception as e:
+            logger.error(f"Heartbeat error: {e}")
+            set_connection_state(health_status="error")
 
 async def heartbeat_task(guardian_host: str, guardian_port: int):
     """Send periodic heartbeat to Guardian"""
-    while connection_state["connected"]:
+    url = f"http://{guardian_host}:{guardian_port}/distributed/peers/heartbeat"
+    while connection_state.connected:
         try:
             metrics = get_system_metrics()
             
-            async with aiohttp.ClientSession() as session:
-                heartbeat_data = {
-                    "node_id": distributed_manager.my_node_id,
-                    "hostname": socket.gethostname(),
-                    "health_status": "healthy",
-                    "metrics": metrics,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                async with session.post(
-                    f"http://{guardian_host}:{guardian_port}/distributed/peers/heartbeat",
-                    json=heartbeat_data
-                ) as response:
-                    if response.status == 200:
-                        connection_state["last_heartbeat"] = datetime.utcnow().isoformat()
-                        connection_state["health_status"] = "healthy"
-                    else:
-                        logger.warning(f"Heartbeat failed with status: {response.status}")
-                        connection_state["health_status"] = "warning"
+            heartbeat_data = {
+                "node_id": distributed_manager.my_node_id,
+                "hostname": HOSTNAME,
+                "health_status": "healthy",
+                "metrics": metrics,
+                "timestamp": datetime.utcnow()
+            }
             
-            # Broadcast metrics update
-            await broadcast_to_websockets({
-                "type": "metrics_update",
-                "metrics": metrics
-            })
+            if _heartbeat_sem.locked():
+                logger.warning("Skipping heartbeat: previous heartbeats still in flight")
+            else:
+                task = asyncio.create_task(_send_heartbeat(url, _dumps_bytes(heartbeat_data)))
+                _heartbeat_tasks.add(task)
+                task.add_done_callback(_heartbeat_tasks.discard)
             
             await asyncio.sleep(30)  # Send heartbeat every 30 seconds
             
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
-            connection_state["health_status"] = "error"
+            set_connection_state(health_status="error")
             await asyncio.sleep(10)  # Shorter interval on error
 
-@app.get("/peer/metrics")
+@app.get("/peer/metrics", response_model=None)
 async def get_metrics():
     """Get current system metrics"""
-    return {
+    return _json_response({
         "node_id": distributed_manager.my_node_id,
         "metrics": get_system_metrics(),
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "window_stats": _latest_stats,
+        "timestamp": datetime.utcnow()
+    })
 
-@app.post("/peer/healing/execute")
+@app.post("/peer/healing/execute", response_model=None)
 async def execute_healing_strategy(request: Dict):
     """Execute a healing strategy received from Guardian"""
     try:
@@ -310,31 +589,31 @@ async def execute_healing_strategy(request: Dict):
             # Simulate phase execution time
             await asyncio.sleep(2)
         
-        return {
+        return _json_response({
             "success": True,
             "message": "Healing strategy executed successfully",
             "strategy_id": strategy.get("strategy_id"),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": datetime.utcnow()
+        })
         
     except Exception as e:
         logger.error(f"Error executing healing strategy: {e}")
-        return {
+        return _json_response({
             "success": False,
             "message": f"Error: {str(e)}",
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": datetime.utcnow()
+        })
 
-@app.get("/health")
+@app.get("/health", response_model=None)
 async def health_check():
     """Health check endpoint"""
-    return {
+    return _json_response({
         "status": "healthy",
         "node_id": distributed_manager.my_node_id,
         "role": "peer",
-        "connected_to_guardian": connection_state["connected"],
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "connected_to_guardian": connection_state.connected,
+        "timestamp": datetime.utcnow()
+    })
 
 if __name__ == "__main__":
     # Start peer server on port 3002
@@ -4,10 +4,42 @@ Triggers automated healing actions and manages system recovery
 """
 
 import asyncio
+import heapq
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+from llm_cache import InMemoryCacheBackend, RedisCacheBackend
+
+# Fixed agent commands, built once and sent as-is (never mutated)
+REMEDIATION_COMMANDS = {
+    'kill_high_cpu_processes': {
+        'type': 'remediation',
+        'action': 'kill_high_cpu_processes',
+        'threshold': 50  # Kill processes using >50% CPU
+    },
+    'clear_memory': {
+        'type': 'remediation',
+        'action': 'clear_memory',
+        'methods': ['garbage_collection', 'cache_clear']
+    },
+    'cleanup_disk': {
+        'type': 'remediation',
+        'action': 'cleanup_disk',
+        'targets': ['temp_files', 'logs', 'cache']
+    },
+    'restart_network': {
+        'type': 'remediation',
+        'action': 'restart_network'
+    },
+    'isolate': {
+        'type': 'isolation',
+        'action': 'isolate',
+        'reason': 'security_threat'
+    }
+}
 
 class RemediationEngine:
     def __init__(self, mongo_handler, neo4j_handler, websocket_manager):
@@ -32,11 +64,82 @@ class RemediationEngine:
             'memory_critical': 95,
             'disk_critical': 95,
             'response_timeout': 30,
-            'max_retries': 3
+            'max_retries': 3,
+            'retry_delay': 10,
+            'heartbeat_timeout': 300,
+            'stuck_timeout': 600,
+            'dedupe_window': 60
+        }
+        
+        # Anomaly type prefix ('cpu_spike' -> 'cpu') -> strategy, then any
+        # security keyword among the type's words
+        self._anomaly_prefix_map = {
+            'cpu': 'cpu_high',
+            'memory': 'memory_high',
+            'network': 'network_anomaly'
         }
+        self._security_keywords = frozenset(('security', 'attack'))
+        
+        # (metrics section, threshold key, strategy) checked per metrics message
+        self.metric_checks = (
+            ('cpu', 'cpu_critical', 'cpu_high'),
+            ('memory', 'memory_critical', 'memory_high'),
+            ('disk', 'disk_critical', 'disk_high')
+        )
+        
+        # Latest metric percentages per agent for the verify_* checks: in
+        # process first, then Redis when configured, then Mongo
+        self.metrics_cache_ttl = 30
+        self._metrics_l1 = InMemoryCacheBackend(max_entries=8192)
+        self._metrics_l2 = None
+        redis_url = os.getenv('METRICS_CACHE_REDIS_URL')
+        if redis_url:
+            try:
+                self._metrics_l2 = RedisCacheBackend(redis_url, prefix='aegis:metrics:')
+            except ImportError as e:
+                self.logger.warning(f"Redis metrics cache unavailable: {e}")
         
-        # Track ongoing remediations
+        # Track ongoing remediations; the heap holds (monotonic start, id)
+        # so stuck ones are found without scanning every entry
         self.active_remediations = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Wakes the expiry loop when the heap goes from empty to non-empty
+        self._expiry_wake = asyncio.Event()
+        
+        # (agent_id, strategy) -> monotonic trigger time; repeats inside the
+        # dedupe window collapse into the remediation already in flight
+        self._inflight: Dict[Tuple[str, str], float] = {}
+        
+        # Strong references so fire-and-forget tasks are not garbage collected
+        self._tasks = set()
+        
+        # Remediations are executed by a fixed pool of workers; a full queue
+        # pushes back on the callers instead of piling up tasks
+        self.remediation_queue = asyncio.Queue(maxsize=1024)
+        self.worker_count = int(os.getenv('REMEDIATION_WORKERS', '16'))
+        self._workers = []
+        
+        # agent_id -> (expires_at, mirror ids); topology changes rarely
+        self._mirror_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self.mirror_cache_ttl = 60
+        self.mirror_cache_size = 4096
+        if neo4j_handler is not None:
+            neo4j_handler.mirror_listeners.append(self.invalidate_mirrors)
+        
+        # agent_id -> loop time of the last heartbeat, oldest first; a single
+        # timer fires at the oldest heartbeat's deadline
+        self._last_heartbeat: Dict[str, float] = {}
+        # Agents past their deadline but still connected -> loop time last heard from
+        self._silent_since: Dict[str, float] = {}
+        self._heartbeat_timer: Optional[asyncio.TimerHandle] = None
+        
+        # Remediation and escalation records are written off the critical
+        # path by a flusher that batches them per collection
+        self._mongo_queue: asyncio.Queue = asyncio.Queue()
+        self._mongo_keys = {'remediations': 'id', 'escalations': 'remediation_id'}
+        self.mongo_batch_size = 128
+        self.mongo_flush_interval = 0.05
+        self._mongo_flusher_task: Optional[asyncio.Task] = None
         
     async def start(self):
         """Start the remediation engine"""
@@ -44,14 +147,41 @@ class RemediationEngine:
         self.running = True
         
         # Start monitoring tasks
-        asyncio.create_task(self.monitor_agent_health())
-        asyncio.create_task(self.process_remediation_queue())
+        self._spawn(self.monitor_agent_health())
+        self._spawn(self.process_remediation_queue())
+        self._mongo_flusher_task = self._spawn(self._mongo_flusher())
+        self._workers = [self._spawn(self._remediation_worker()) for _ in range(self.worker_count)]
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task and hold a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
         
     async def stop(self):
         """Stop the remediation engine"""
         self.logger.info("Stopping Remediation Engine")
         self.running = False
         
+        # Workers are parked on the queue, wake them up to exit
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        
+        if self._heartbeat_timer:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+        self._expiry_wake.set()
+        
+        # Write out whatever is still queued before the database goes away;
+        # the flusher drains up to the sentinel and exits, so a batch it has
+        # already dequeued is never lost to cancellation
+        if self._mongo_flusher_task:
+            self._mongo_queue.put_nowait(None)
+            await self._mongo_flusher_task
+            self._mongo_flusher_task = None
+        
     def is_running(self) -> bool:
         """Check if remediation engine is running"""
         return self.running
@@ -59,80 +189,157 @@ class RemediationEngine:
     async def analyze_metrics(self, metrics_data: Dict):
         """Analyze metrics and trigger remediation if needed"""
         agent_id = metrics_data.get('agent_id')
-        
-        # Check CPU usage
-        cpu_percent = metrics_data.get('cpu', {}).get('percent', 0)
-        if cpu_percent > self.thresholds['cpu_critical']:
-            await self.trigger_remediation(agent_id, 'cpu_high', {
-                'current_value': cpu_percent,
-                'threshold': self.thresholds['cpu_critical'],
-                'metrics': metrics_data
-            })
-        
-        # Check memory usage
-        memory_percent = metrics_data.get('memory', {}).get('percent', 0)
-        if memory_percent > self.thresholds['memory_critical']:
-            await self.trigger_remediation(agent_id, 'memory_high', {
-                'current_value': memory_percent,
-                'threshold': self.thresholds['memory_critical'],
-                'metrics': metrics_data
-            })
-        
-        # Check disk usage
-        disk_percent = metrics_data.get('disk', {}).get('percent', 0)
-        if disk_percent > self.thresholds['disk_critical']:
-            await self.trigger_remediation(agent_id, 'disk_high', {
-                'current_value': disk_percent,
-                'threshold': self.thresholds['disk_critical'],
-                'metrics': metrics_data
-            })
+        percents = self._metric_percents(metrics_data)
+        await self._cache_metrics(agent_id, percents)
+        
+        # Collect every breached threshold before touching the database
+        breaches = []
+        for section, threshold_key, strategy in self.metric_checks:
+            percent = percents[section]
+            threshold = self.thresholds[threshold_key]
+            if percent > threshold:
+                breaches.append((strategy, {
+                    'current_value': percent,
+                    'threshold': threshold,
+                    'metrics': metrics_data
+                }))
+        
+        if breaches:
+            await self.trigger_remediations(agent_id, breaches)
     
     async def handle_anomaly(self, anomaly_data: Dict):
         """Handle detected anomaly"""
         agent_id = anomaly_data.get('agent_id')
-        anomaly_type = anomaly_data.get('type')
+        # Normalized once here; strategy handlers see the lowercased type
+        anomaly_type = (anomaly_data.get('type') or '').lower()
+        anomaly_data['type'] = anomaly_type
         severity = anomaly_data.get('severity', 'info')
         
         self.logger.warning(f"Anomaly detected: {anomaly_type} on {agent_id} (severity: {severity})")
         
         # Map anomaly types to remediation strategies
-        if anomaly_type.startswith('cpu'):
-            await self.trigger_remediation(agent_id, 'cpu_high', anomaly_data)
-        elif anomaly_type.startswith('memory'):
-            await self.trigger_remediation(agent_id, 'memory_high', anomaly_data)
-        elif anomaly_type.startswith('network'):
-            await self.trigger_remediation(agent_id, 'network_anomaly', anomaly_data)
-        elif 'security' in anomaly_type or 'attack' in anomaly_type:
-            await self.trigger_remediation(agent_id, 'security_threat', anomaly_data)
+        strategy = self._anomaly_strategy(anomaly_type)
+        if strategy:
+            await self.trigger_remediation(agent_id, strategy, anomaly_data)
         
         # Notify dashboards
         await self.websocket_manager.notify_anomaly_to_dashboards(anomaly_data)
     
-    async def trigger_remediation(self, agent_id: str, strategy: str, context: Dict):
-        """Trigger a remediation strategy"""
-        remediation_id = f"{agent_id}_{strategy}_{datetime.utcnow().timestamp()}"
-        
-        remediation_info = {
-            'id': remediation_id,
+    def _new_remediation(self, agent_id: str, strategy: str, context: Dict, now_iso: str) -> Dict:
+        """Build a remediation record"""
+        return {
+            'id': f"{agent_id}_{strategy}_{time.time_ns()}",
             'agent_id': agent_id,
             'strategy': strategy,
             'context': context,
             'status': 'initiated',
-            'started_at': datetime.utcnow().isoformat(),
+            'started_at': now_iso,
             'retries': 0
         }
-        
-        # Store remediation record
-        await self.mongo_handler.store_remediation(remediation_info)
-        
-        # Track active remediation
+    
+    async def _launch_remediation(self, remediation_info: Dict):
+        """Track a stored remediation and queue it for execution"""
+        remediation_id = remediation_info['id']
         self.active_remediations[remediation_id] = remediation_info
+        if not self._expiry_heap:
+            self._expiry_wake.set()
+        heapq.heappush(self._expiry_heap, (time.monotonic(), remediation_id))
         
         # Execute remediation strategy
-        if strategy in self.remediation_strategies:
-            asyncio.create_task(self.execute_remediation(remediation_id))
+        if remediation_info['strategy'] in self.remediation_strategies:
+            await self.remediation_queue.put(remediation_id)
         else:
-            self.logger.error(f"Unknown remediation strategy: {strategy}")
+            self.logger.error(f"Unknown remediation strategy: {remediation_info['strategy']}")
+    
+    def _claim(self, agent_id: str, strategy: str) -> bool:
+        """Reserve (agent_id, strategy) unless it was triggered within the dedupe window"""
+        now = time.monotonic()
+        key = (agent_id, strategy)
+        if now - self._inflight.get(key, float('-inf')) < self.thresholds['dedupe_window']:
+            return False
+        self._inflight[key] = now
+        return True
+    
+    def _anomaly_strategy(self, anomaly_type: str) -> Optional[str]:
+        """Remediation strategy for an anomaly type, if any"""
+        words = anomaly_type.split('_')
+        strategy = self._anomaly_prefix_map.get(words[0])
+        if strategy is None and not self._security_keywords.isdisjoint(words):
+            strategy = 'security_threat'
+        return strategy
+    
+    async def trigger_remediation(self, agent_id: str, strategy: str, context: Dict):
+        """Trigger a remediation strategy"""
+        if not self._claim(agent_id, strategy):
+            return
+        
+        remediation_info = self._new_remediation(agent_id, strategy, context, datetime.utcnow().isoformat())
+        
+        # Store remediation record
+        self._queue_write('remediations', remediation_info)
+        
+        await self._launch_remediation(remediation_info)
+    
+    async def trigger_remediations(self, agent_id: str, breaches: List[Tuple[str, Dict]]):
+        """Trigger several remediation strategies for one metrics message"""
+        now_iso = datetime.utcnow().isoformat()
+        for strategy, context in breaches:
+            if not self._claim(agent_id, strategy):
+                continue
+            remediation_info = self._new_remediation(agent_id, strategy, context, now_iso)
+            # Queued records of this message go out in the same batch
+            self._queue_write('remediations', remediation_info)
+            await self._launch_remediation(remediation_info)
+    
+    def _queue_write(self, collection: str, doc: Dict):
+        """Queue a snapshot of a record for the background flusher"""
+        self._mongo_queue.put_nowait((collection, dict(doc)))
+    
+    async def _mongo_flusher(self):
+        """Write queued records every flush interval or batch size, whichever comes first
+        
+        A None on the queue (put by stop) flushes what came before it and exits.
+        """
+        while True:
+            item = await self._mongo_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            if self._mongo_queue.qsize() < self.mongo_batch_size:
+                await asyncio.sleep(self.mongo_flush_interval)
+            stopping = False
+            while len(batch) < self.mongo_batch_size and not self._mongo_queue.empty():
+                item = self._mongo_queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush_mongo(batch)
+            if stopping:
+                return
+    
+    async def _flush_mongo(self, batch: List[Tuple[str, Dict]]):
+        """One ordered bulk upsert per collection"""
+        by_collection: Dict[str, List[Dict]] = {}
+        for collection, doc in batch:
+            by_collection.setdefault(collection, []).append(doc)
+        
+        for collection, docs in by_collection.items():
+            try:
+                await self.mongo_handler.bulk_upsert(collection, self._mongo_keys[collection], docs)
+            except Exception as e:
+                self.logger.error(f"Dropped {len(docs)} queued {collection} writes: {e}")
+    
+    async def _remediation_worker(self):
+        """Execute queued remediations one at a time"""
+        while self.running:
+            remediation_id = await self.remediation_queue.get()
+            try:
+                await self.execute_remediation(remediation_id)
+            except Exception as e:
+                self.logger.error(f"Remediation worker error for {remediation_id}: {e}")
+            finally:
+                self.remediation_queue.task_done()
     
     async def execute_remediation(self, remediation_id: str):
         """Execute a specific remediation"""
@@ -153,44 +360,55 @@ class RemediationEngine:
             # Update remediation status
             if success:
                 remediation['status'] = 'completed'
-                remediation['completed_at'] = datetime.utcnow().isoformat()
                 self.logger.info(f"Remediation {remediation_id} completed successfully")
-            else:
-                await self.handle_remediation_failure(remediation_id)
+            elif await self.handle_remediation_failure(remediation_id):
+                # Retry scheduled; the record stays active until it settles
+                return
                 
         except Exception as e:
             self.logger.error(f"Remediation {remediation_id} failed: {e}")
             remediation['status'] = 'failed'
             remediation['error'] = str(e)
             
-        # Update database
-        await self.mongo_handler.update_remediation(remediation_id, remediation)
-        
-        # Notify dashboards
-        await self.websocket_manager.notify_remediation_to_dashboards(remediation)
-        
-        # Clean up
-        self.active_remediations.pop(remediation_id, None)
+        # Queue the database update and notify dashboards
+        try:
+            now_iso = datetime.utcnow().isoformat()
+            if remediation['status'] == 'completed':
+                remediation.setdefault('completed_at', now_iso)
+            remediation['updated_at'] = now_iso
+            self._queue_write('remediations', remediation)
+            await self.websocket_manager.notify_remediation_to_dashboards(remediation)
+        finally:
+            # Clean up
+            self.active_remediations.pop(remediation_id, None)
+            self._inflight.pop((agent_id, strategy), None)
     
-    async def handle_remediation_failure(self, remediation_id: str):
-        """Handle failed remediation"""
+    async def handle_remediation_failure(self, remediation_id: str) -> bool:
+        """Handle failed remediation; returns True when a retry was scheduled"""
         remediation = self.active_remediations.get(remediation_id)
         if not remediation:
-            return
+            return False
         
         remediation['retries'] += 1
         
         if remediation['retries'] < self.thresholds['max_retries']:
             self.logger.info(f"Retrying remediation {remediation_id} (attempt {remediation['retries']})")
-            # Retry after delay
-            await asyncio.sleep(10)
-            await self.execute_remediation(remediation_id)
-        else:
-            self.logger.error(f"Remediation {remediation_id} failed after {remediation['retries']} attempts")
-            remediation['status'] = 'failed'
-            
-            # Escalate to human intervention
-            await self.escalate_to_human(remediation)
+            # Retry after delay, back through the worker queue
+            self._spawn(self._requeue_later(remediation_id, self.thresholds['retry_delay']))
+            return True
+        
+        self.logger.error(f"Remediation {remediation_id} failed after {remediation['retries']} attempts")
+        remediation['status'] = 'failed'
+        
+        # Escalate to human intervention
+        await self.escalate_to_human(remediation)
+        return False
+    
+    async def _requeue_later(self, remediation_id: str, delay: float):
+        """Put a remediation back on the worker queue once the delay has passed"""
+        await asyncio.sleep(delay)
+        if self.running and remediation_id in self.active_remediations:
+            await self.remediation_queue.put(remediation_id)
     
     async def escalate_to_human(self, remediation: Dict):
         """Escalate failed remediation to human intervention"""
@@ -204,7 +422,7 @@ class RemediationEngine:
         }
         
         # Store escalation
-        await self.mongo_handler.store_escalation(escalation)
+        self._queue_write('escalations', escalation)
         
         # Notify dashboards
         await self.websocket_manager.broadcast_to_dashboards({
@@ -218,13 +436,7 @@ class RemediationEngine:
         self.logger.info(f"Handling high CPU for agent {agent_id}")
         
         # Send command to agent to kill high CPU processes
-        command = {
-            'type': 'remediation',
-            'action': 'kill_high_cpu_processes',
-            'threshold': 50  # Kill processes using >50% CPU
-        }
-        
-        success = await self.websocket_manager.send_to_agent(agent_id, command)
+        success = await self.websocket_manager.send_to_agent(agent_id, REMEDIATION_COMMANDS['kill_high_cpu_processes'])
         
         if success:
             # Wait and verify improvement
@@ -237,13 +449,7 @@ class RemediationEngine:
         """Handle high memory usage"""
         self.logger.info(f"Handling high memory for agent {agent_id}")
         
-        command = {
-            'type': 'remediation',
-            'action': 'clear_memory',
-            'methods': ['garbage_collection', 'cache_clear']
-        }
-        
-        success = await self.websocket_manager.send_to_agent(agent_id, command)
+        success = await self.websocket_manager.send_to_agent(agent_id, REMEDIATION_COMMANDS['clear_memory'])
         
         if success:
             await asyncio.sleep(20)
@@ -255,13 +461,7 @@ class RemediationEngine:
         """Handle high disk usage"""
         self.logger.info(f"Handling high disk usage for agent {agent_id}")
         
-        command = {
-            'type': 'remediation',
-            'action': 'cleanup_disk',
-            'targets': ['temp_files', 'logs', 'cache']
-        }
-        
-        success = await self.websocket_manager.send_to_agent(agent_id, command)
+        success = await self.websocket_manager.send_to_agent(agent_id, REMEDIATION_COMMANDS['cleanup_disk'])
         
         if success:
             await asyncio.sleep(30)
@@ -273,19 +473,14 @@ class RemediationEngine:
         """Handle network anomaly"""
         self.logger.info(f"Handling network anomaly for agent {agent_id}")
         
-        # Check if it's a DDoS-like attack
-        if 'ddos' in context.get('type', '').lower():
+        # Check if it's a DDoS-like attack (type is lowercased in handle_anomaly)
+        if 'ddos' in context.get('type', ''):
             # Temporarily isolate the agent
             await self.isolate_agent(agent_id)
             return True
         
         # For other network issues, try to restart network
-        command = {
-            'type': 'remediation',
-            'action': 'restart_network'
-        }
-        
-        return await self.websocket_manager.send_to_agent(agent_id, command)
+        return await self.websocket_manager.send_to_agent(agent_id, REMEDIATION_COMMANDS['restart_network'])
     
     async def handle_agent_offline(self, agent_id: str, context: Dict) -> bool:
         """Handle offline agent"""
@@ -331,13 +526,7 @@ class RemediationEngine:
         await self.neo4j_handler.update_agent_status(agent_id, "isolated")
         
         # Send isolation command
-        command = {
-            'type': 'isolation',
-            'action': 'isolate',
-            'reason': 'security_threat'
-        }
-        
-        await self.websocket_manager.send_to_agent(agent_id, command)
+        await self.websocket_manager.send_to_agent(agent_id, REMEDIATION_COMMANDS['isolate'])
         
         # Notify other agents to avoid this agent
         await self.websocket_manager.broadcast_to_agents({
@@ -347,15 +536,35 @@ class RemediationEngine:
     
     async def find_mirror_agent(self, agent_id: str) -> Optional[str]:
         """Find mirror agent for failover"""
-        # Query Neo4j for mirror relationships
-        mirrors = await self.neo4j_handler.get_agent_mirrors(agent_id)
+        # Mirror relationships, from Neo4j at most once per TTL
+        mirrors = await self._mirrors(agent_id)
         
         # Return first available mirror
-        for mirror_id in mirrors:
-            if self.websocket_manager.is_agent_connected(mirror_id):
-                return mirror_id
+        connected = self.websocket_manager.connected_agents
+        return next((mirror_id for mirror_id in mirrors if mirror_id in connected), None)
+    
+    async def _mirrors(self, agent_id: str) -> List[str]:
+        """Cached get_agent_mirrors lookup"""
+        now = time.monotonic()
+        entry = self._mirror_cache.get(agent_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
         
-        return None
+        mirrors = await self.neo4j_handler.get_agent_mirrors(agent_id)
+        # An empty result may be a failed query, so it is not cached
+        if mirrors:
+            if len(self._mirror_cache) >= self.mirror_cache_size:
+                self._mirror_cache = {
+                    key: value for key, value in self._mirror_cache.items() if value[0] > now
+                }
+                if len(self._mirror_cache) >= self.mirror_cache_size:
+                    self._mirror_cache.clear()
+            self._mirror_cache[agent_id] = (now + self.mirror_cache_ttl, mirrors)
+        return mirrors
+    
+    def invalidate_mirrors(self, agent_id: str):
+        """Drop the cached mirrors of an agent"""
+        self._mirror_cache.pop(agent_id, None)
     
     async def transfer_to_mirror(self, failed_agent: str, mirror_agent: str):
         """Transfer responsibilities to mirror agent"""
@@ -372,54 +581,175 @@ class RemediationEngine:
         
         # Update relationships in Neo4j
         await self.neo4j_handler.create_takeover_relationship(mirror_agent, failed_agent)
+        self.invalidate_mirrors(failed_agent)
+        self.invalidate_mirrors(mirror_agent)
+    
+    def _metric_percents(self, metrics_data: Dict) -> Dict[str, float]:
+        """Percentages of the sections checked against thresholds"""
+        return {
+            section: metrics_data.get(section, {}).get('percent', 0)
+            for section, _, _ in self.metric_checks
+        }
+    
+    async def _cache_metrics(self, agent_id: str, percents: Dict[str, float]):
+        """Record an agent's latest percentages in both cache tiers"""
+        if not agent_id:
+            return
+        value = json.dumps(percents)
+        await self._metrics_l1.set(agent_id, value, self.metrics_cache_ttl)
+        if self._metrics_l2 is not None:
+            # Keep the Redis round trip off the ingestion path
+            self._spawn(self._store_metrics_l2(agent_id, value))
+    
+    async def _store_metrics_l2(self, agent_id: str, value: str):
+        """Background write of an agent's percentages to Redis"""
+        try:
+            await self._metrics_l2.set(agent_id, value, self.metrics_cache_ttl)
+        except Exception as e:
+            self.logger.warning(f"Redis metrics cache store failed: {e}")
+    
+    async def _recent_metrics(self, agent_id: str) -> Optional[Dict[str, float]]:
+        """Latest percentages for an agent: L1, then Redis, then Mongo"""
+        value = await self._metrics_l1.get(agent_id)
+        if value is None and self._metrics_l2 is not None:
+            try:
+                value = await self._metrics_l2.get(agent_id)
+            except Exception as e:
+                self.logger.warning(f"Redis metrics cache lookup failed: {e}")
+            if value is not None:
+                await self._metrics_l1.set(agent_id, value, self.metrics_cache_ttl)
+        if value is not None:
+            return json.loads(value)
+        
+        latest = await self.mongo_handler.get_agent_metrics(agent_id, limit=1)
+        if not latest:
+            return None
+        percents = self._metric_percents(latest[0])
+        await self._metrics_l1.set(agent_id, json.dumps(percents), self.metrics_cache_ttl)
+        return percents
+    
+    async def _verify_below(self, agent_id: str, section: str, threshold_key: str) -> bool:
+        """True unless the latest sample is still above the threshold"""
+        metrics = await self._recent_metrics(agent_id)
+        # No data to judge by; do not fail the remediation on that alone
+        if metrics is None:
+            return True
+        return metrics[section] <= self.thresholds[threshold_key]
     
     async def verify_cpu_improvement(self, agent_id: str) -> bool:
         """Verify CPU usage has improved"""
-        # This would check recent metrics
-        # For now, return True as placeholder
-        return True
+        return await self._verify_below(agent_id, 'cpu', 'cpu_critical')
     
     async def verify_memory_improvement(self, agent_id: str) -> bool:
         """Verify memory usage has improved"""
-        return True
+        return await self._verify_below(agent_id, 'memory', 'memory_critical')
     
     async def verify_disk_improvement(self, agent_id: str) -> bool:
         """Verify disk usage has improved"""
-        return True
+        return await self._verify_below(agent_id, 'disk', 'disk_critical')
     
     async def monitor_agent_health(self):
-        """Monitor agent health and trigger remediations"""
-        while self.running:
-            try:
-                # Check for agents that haven't sent heartbeat recently
-                offline_agents = await self.mongo_handler.get_offline_agents(minutes=5)
-                
-                for agent_id in offline_agents:
-                    if not self.websocket_manager.is_agent_connected(agent_id):
-                        await self.trigger_remediation(agent_id, 'agent_offline', {
-                            'reason': 'no_heartbeat',
-                            'last_seen': datetime.utcnow().isoformat()
-                        })
-                
-                await asyncio.sleep(60)  # Check every minute
-                
-            except Exception as e:
-                self.logger.error(f"Error in agent health monitoring: {e}")
-                await asyncio.sleep(30)
+        """Sweep agents that went quiet while the guardian was down
+        
+        After this, offline detection is driven by record_heartbeat.
+        """
+        try:
+            offline_agents = await self.mongo_handler.get_offline_agents(
+                minutes=self.thresholds['heartbeat_timeout'] // 60
+            )
+            
+            connected = self.websocket_manager.connected_agents
+            now_iso = datetime.utcnow().isoformat()
+            for agent_id in offline_agents:
+                if agent_id not in self._last_heartbeat and agent_id not in connected:
+                    await self.trigger_remediation(agent_id, 'agent_offline', {
+                        'reason': 'no_heartbeat',
+                        'last_seen': now_iso
+                    })
+            
+        except Exception as e:
+            self.logger.error(f"Error in agent health monitoring: {e}")
+    
+    def record_heartbeat(self, agent_id: str):
+        """Note an inbound heartbeat and keep the expiry timer armed"""
+        if not self.running or not agent_id:
+            return
+        
+        loop = asyncio.get_running_loop()
+        # Re-insert so the dict stays ordered by heartbeat time
+        self._last_heartbeat.pop(agent_id, None)
+        self._last_heartbeat[agent_id] = loop.time()
+        self._silent_since.pop(agent_id, None)
+        
+        if self._heartbeat_timer is None:
+            self._arm_heartbeat_timer(loop)
+    
+    def _arm_heartbeat_timer(self, loop: asyncio.AbstractEventLoop):
+        """Schedule the check for the oldest heartbeat's deadline"""
+        self._heartbeat_timer = None
+        if self._last_heartbeat:
+            oldest = next(iter(self._last_heartbeat.values()))
+            self._heartbeat_timer = loop.call_at(
+                oldest + self.thresholds['heartbeat_timeout'], self._check_heartbeats
+            )
+    
+    def _check_heartbeats(self):
+        """Timer callback: only the agents whose deadline passed are checked"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        cutoff = now - self.thresholds['heartbeat_timeout']
+        connected = self.websocket_manager.connected_agents
+        wall_now = datetime.utcnow()
+        
+        while self._last_heartbeat:
+            agent_id, last_seen = next(iter(self._last_heartbeat.items()))
+            if last_seen > cutoff:
+                break
+            del self._last_heartbeat[agent_id]
+            
+            if agent_id in connected:
+                # Silent but its socket is still open; keep it tracked and
+                # look again one timeout from now
+                self._silent_since.setdefault(agent_id, last_seen)
+                self._last_heartbeat[agent_id] = now
+            else:
+                last_seen = self._silent_since.pop(agent_id, last_seen)
+                self._spawn(self.trigger_remediation(agent_id, 'agent_offline', {
+                    'reason': 'no_heartbeat',
+                    'last_seen': (wall_now - timedelta(seconds=now - last_seen)).isoformat()
+                }))
+        
+        if self.running:
+            self._arm_heartbeat_timer(loop)
     
     async def process_remediation_queue(self):
         """Process pending remediations"""
         while self.running:
             try:
-                # Check for stuck remediations
-                for remediation_id, remediation in list(self.active_remediations.items()):
-                    started_at = datetime.fromisoformat(remediation['started_at'])
-                    if datetime.utcnow() - started_at > timedelta(minutes=10):
-                        self.logger.warning(f"Remediation {remediation_id} appears stuck, cleaning up")
-                        self.active_remediations.pop(remediation_id, None)
+                # Sleep until the oldest remediation could be stuck; with
+                # nothing tracked, sleep until one is
+                timeout = None
+                if self._expiry_heap:
+                    timeout = max(
+                        self._expiry_heap[0][0] + self.thresholds['stuck_timeout'] - time.monotonic(), 0
+                    )
+                try:
+                    await asyncio.wait_for(self._expiry_wake.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._expiry_wake.clear()
                 
-                await asyncio.sleep(30)
+                self._expire_stuck()
                 
             except Exception as e:
                 self.logger.error(f"Error in remediation queue processing: {e}")
                 await asyncio.sleep(30)
+    
+    def _expire_stuck(self):
+        """Drop stuck remediations; only entries past the cutoff are visited"""
+        cutoff = time.monotonic() - self.thresholds['stuck_timeout']
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            _, remediation_id = heapq.heappop(self._expiry_heap)
+            # Finished remediations have already left the dict
+            if self.active_remediations.pop(remediation_id, None) is not None:
+                self.logger.warning(f"Remediation {remediation_id} appears stuck, cleaning up")
@@ -6,40 +6,49 @@ Quick start script for the Guardian server
 
 import sys
 import os
+import hashlib
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def install_dependencies():
-    """Install required dependencies"""
+def _requirements_digest(requirements_file: Path) -> str:
+    """Hash of requirements.txt, recorded after a successful install"""
+    return hashlib.blake2b(requirements_file.read_bytes(), digest_size=16).hexdigest()
+
+def install_dependencies(core_available: bool = False):
+    """Install required dependencies unless this requirements.txt is already installed"""
     requirements_file = Path(__file__).parent / "requirements.txt"
+    stamp_file = requirements_file.with_name(".deps.stamp")
     
     if requirements_file.exists():
+        digest = _requirements_digest(requirements_file)
+        if core_available:
+            if not stamp_file.exists():
+                # Runnable checkout from before the stamp existed: adopt the
+                # current requirements as installed instead of reinstalling
+                stamp_file.write_text(digest)
+            if stamp_file.read_text().strip() == digest:
+                print("✅ Dependencies up to date")
+                return
+        
         print("Installing Guardian server dependencies...")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-        ])
+        uv = shutil.which("uv")
+        if uv:
+            # uv resolves and installs much faster; target this interpreter
+            subprocess.check_call([
+                uv, "pip", "install", "--python", sys.executable, "-r", str(requirements_file)
+            ])
+        else:
+            subprocess.check_call([
+                sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
+            ])
+        stamp_file.write_text(digest)
     else:
         print("requirements.txt not found")
 
-def check_database_connections():
-    """Check if databases are available"""
-    print("Checking database connections...")
-    
-    # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
-    import os
-    
-    # Debug: Show environment variables
-    mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
-    neo4j_uri = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
-    neo4j_user = os.getenv('NEO4J_USER', 'neo4j')
-    neo4j_password = os.getenv('NEO4J_PASSWORD', 'password')
-    
-    print(f"🔧 MongoDB URI: {mongodb_uri[:50]}...")
-    print(f"🔧 Neo4j URI: {neo4j_uri}")
-    
-    # Check MongoDB
+def _check_mongo(mongodb_uri):
+    """Ping MongoDB"""
     try:
         import pymongo
         client = pymongo.MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
@@ -50,8 +59,9 @@ def check_database_connections():
         print("⚠️  PyMongo not installed - install with: pip install pymongo")
     except Exception as e:
         print(f"⚠️  MongoDB connection failed: {e}")
-    
-    # Check Neo4j (optional)
+
+def _check_neo4j(neo4j_uri, neo4j_user, neo4j_password):
+    """Run a trivial query against Neo4j (optional)"""
     try:
         from neo4j import GraphDatabase
         # Configure driver based on URI scheme
@@ -69,17 +79,50 @@ def check_database_connections():
     except Exception as e:
         print(f"⚠️  Neo4j connection failed: {e}")
 
+def check_database_connections():
+    """Check if databases are available"""
+    print("Checking database connections...")
+    
+    # Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+    import os
+    
+    # Debug: Show environment variables
+    mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
+    neo4j_uri = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
+    neo4j_user = os.getenv('NEO4J_USER', 'neo4j')
+    neo4j_password = os.getenv('NEO4J_PASSWORD', 'password')
+    
+    print(f"🔧 MongoDB URI: {mongodb_uri[:50]}...")
+    print(f"🔧 Neo4j URI: {neo4j_uri}")
+    
+    # Both probes wait on the network, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_check_mongo, mongodb_uri),
+            executor.submit(_check_neo4j, neo4j_uri, neo4j_user, neo4j_password)
+        ]
+        for future in futures:
+            future.result()
+
 def main():
     """Main startup function"""
     print("=" * 60)
     print("🛡️  Aegis of Alderaan - Guardian Server Startup")
     print("=" * 60)
     
-    # Check if dependencies need to be installed
+    # Check if dependencies need to be installed; pip only runs when core
+    # imports fail or requirements.txt changed since the last install
     try:
         import fastapi
         import uvicorn
         print("✅ Core dependencies available")
+        try:
+            install_dependencies(core_available=True)
+        except subprocess.CalledProcessError as e:
+            # Already runnable; a failed refresh (e.g. offline) is not fatal
+            print(f"⚠️  Dependency refresh failed: {e}")
     except ImportError as e:
         print(f"Missing core dependency: {e}")
         print("Installing dependencies...")
@@ -104,6 +147,14 @@ def main():
     except ImportError:
         print("⚠️  PyJWT not available - install with: pip install PyJWT")
     
+    try:
+        import uvloop
+        event_loop = "uvloop"
+        print("✅ uvloop event loop available")
+    except ImportError:
+        event_loop = "asyncio"
+        print("⚠️  uvloop not available - using the default asyncio event loop")
+    
     # Check database connections
     check_database_connections()
     
@@ -125,6 +176,7 @@ def main():
             host="0.0.0.0",
             port=3001,
             reload=True,
+            loop=event_loop,
             log_level="info"
         )
         
@@ -0,0 +1,74 @@
+"""
+Aegis of Alderaan - WebSocket Bus
+Redis pub/sub relay between guardian worker processes
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# Every worker listens here and re-broadcasts to its own dashboards / agents
+DASHBOARD_CHANNEL = 'aegis:dash'
+AGENT_BROADCAST_CHANNEL = 'aegis:agents:all'
+# Per-worker channel for messages to one agent that worker holds
+AGENT_CHANNEL_PREFIX = 'aegis:agent:'
+# Hash of agent_id -> id of the worker holding its WebSocket
+AGENT_DIRECTORY = 'aegis:agent-owner'
+
+class WebSocketBus:
+    """Moves encoded messages between workers; knows nothing about their contents"""
+
+    def __init__(self, url: str, worker_id: str = None):
+        if aioredis is None:
+            raise ImportError("redis package is required for WebSocketBus")
+        self.client = aioredis.from_url(url)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.agent_channel = AGENT_CHANNEL_PREFIX + self.worker_id
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self, handler: Callable[[str, bytes], Awaitable[None]]):
+        """Subscribe to the shared channels and this worker's agent channel"""
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(DASHBOARD_CHANNEL, AGENT_BROADCAST_CHANNEL, self.agent_channel)
+        self._listener = asyncio.create_task(self._listen(handler))
+        self.logger.info(f"WebSocket bus started as worker {self.worker_id}")
+
+    async def _listen(self, handler: Callable[[str, bytes], Awaitable[None]]):
+        async for item in self._pubsub.listen():
+            try:
+                await handler(item['channel'].decode(), item['data'])
+            except Exception as e:
+                self.logger.error(f"WebSocket bus handler failed: {e}")
+
+    async def publish(self, channel: str, data: bytes) -> int:
+        """Publish to a channel; returns how many workers received it"""
+        return await self.client.publish(channel, data)
+
+    async def claim_agent(self, agent_id: str):
+        """Record this worker as the holder of an agent's connection"""
+        await self.client.hset(AGENT_DIRECTORY, agent_id, self.worker_id)
+
+    async def release_agent(self, agent_id: str):
+        """Drop the directory entry, unless the agent already reconnected elsewhere"""
+        if await self.agent_owner(agent_id) == self.worker_id:
+            await self.client.hdel(AGENT_DIRECTORY, agent_id)
+
+    async def agent_owner(self, agent_id: str) -> Optional[str]:
+        owner = await self.client.hget(AGENT_DIRECTORY, agent_id)
+        return owner.decode() if owner is not None else None
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        await self.client.aclose()
@@ -6,19 +6,207 @@ Manages real-time agent and dashboard connections
 import asyncio
 import json
 import logging
-from typing import Dict, List, Set, Optional
+import threading
+import time
+import zlib
+from typing import Awaitable, Dict, KeysView, List, Set, Optional, Union
+import msgspec
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
+from jwt_utils import JWTManager
+from websocket_bus import WebSocketBus, DASHBOARD_CHANNEL, AGENT_BROADCAST_CHANNEL, AGENT_CHANNEL_PREFIX
 
-class WebSocketManager:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_default(obj):
+    """Encode datetimes as ISO strings and anything else (e.g. ObjectId) as text"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+# Fallback for managers built without the app's JWTManager; one per process
+# so its validated-token cache outlives a single handshake
+_jwt_manager: Optional[JWTManager] = None
+_jwt_manager_lock = threading.Lock()
+
+def _get_jwt_manager() -> JWTManager:
+    """Process-wide JWTManager, created on first use"""
+    global _jwt_manager
+    if _jwt_manager is None:
+        with _jwt_manager_lock:
+            if _jwt_manager is None:
+                _jwt_manager = JWTManager()
+    return _jwt_manager
+
+# (millisecond, ISO string) of the last timestamp handed out
+_now_iso_cache = (0, '')
+
+def _now_iso() -> str:
+    """Current UTC time as ISO text, shared by every message stamped in the same millisecond"""
+    global _now_iso_cache
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _now_iso_cache[0]:
+        _now_iso_cache = (now_ms, datetime.utcfromtimestamp(now_ms / 1000).isoformat())
+    return _now_iso_cache[1]
+
+def _dumps(obj) -> str:
+    """Serialize a WebSocket message, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, default=_json_default)
+
+def _dumps_bytes(obj) -> bytes:
+    """Serialize a message as UTF-8 JSON bytes (bus envelopes)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+# Clients offering this subprotocol receive MessagePack binary frames; the
+# rest keep JSON. Inbound frames stay JSON either way. Each binary frame
+# starts with a tag byte saying whether the body is zlib-compressed
+MSGPACK_SUBPROTOCOL = "aegis.msgpack.v1"
+_msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_json_default)
+# {"type": "batch", "items": <array header goes here>}
+_MSGPACK_BATCH_HEAD = _msgpack_encoder.encode({"type": "batch", "items": []})[:-1]
+
+FRAME_RAW = b'\x00'
+FRAME_ZLIB = b'\x01'
+COMPRESS_THRESHOLD = 512  # bytes; smaller bodies don't shrink enough to pay for it
+
+def _frame(body: bytes) -> bytes:
+    """Tag a packed body, compressing it when it is large enough"""
+    if len(body) > COMPRESS_THRESHOLD:
+        return FRAME_ZLIB + zlib.compress(body, 1)
+    return FRAME_RAW + body
+
+def _msgpack_batch(items: List[bytes]) -> bytes:
+    """Wrap already packed messages in a batch envelope without re-encoding them"""
+    count = len(items)
+    header = bytes((0x90 | count,)) if count < 16 else b'\xdc' + count.to_bytes(2, 'big')
+    return _MSGPACK_BATCH_HEAD + header + b''.join(items)
+
+# A broadcast waits this long for any one agent before giving up on it
+BROADCAST_SEND_TIMEOUT = 2.0  # seconds
+# Any other single write (direct sends, dashboard frames, close frames)
+SEND_TIMEOUT = 5.0  # seconds
+
+# Per-dashboard outbound queue; a sender task drains it in batches
+DASHBOARD_QUEUE_SIZE = 256
+DASHBOARD_MAX_BATCH = 64
+# Snapshots a later message supersedes; shed first when a dashboard falls behind
+DROPPABLE_TYPES = frozenset(('metrics_update', 'topology_update', 'agent_status', 'health_check'))
+# Sender wake-ups in a row that find the queue overflowed before the dashboard is dropped
+DASHBOARD_MAX_OVERFLOWS = 3
+# Topology snapshots arriving within this window go out as one (the latest)
+TOPOLOGY_DEBOUNCE = 0.1  # seconds
+
+def _data_message_encoder(message_type: str):
+    """JSON encoder for a {"type", "data", "timestamp"} message of one fixed type
+    
+    The constant head is serialized once; each call only splices in the
+    already encoded data and the timestamp (ISO text, nothing to escape).
+    """
+    head = _dumps({"type": message_type})[:-1] + ',"data":'
+    def encode(data_json: str, timestamp: str) -> str:
+        return head + data_json + ',"timestamp":"' + timestamp + '"}'
+    return encode
+
+_DATA_MESSAGE_ENCODERS = {
+    message_type: _data_message_encoder(message_type)
+    for message_type in ("anomaly_alert", "remediation_action", "topology_update")
+}
+
+def _bus_envelope(origin: str, body: bytes) -> bytes:
+    """Prefix a bus message with the publishing worker so it can skip its own echo"""
+    return origin.encode() + b'\n' + body
+
+class AgentSockets(dict):
+    """agent_id -> websocket map that keeps its websocket -> agent_id inverse in step
+    
+    Only item assignment and pop_socket maintain the inverse; use those to mutate.
+    """
+    
     def __init__(self):
+        super().__init__()
+        self.inverse: Dict[WebSocket, str] = {}
+    
+    def __setitem__(self, agent_id: str, websocket: WebSocket):
+        # A reconnect replaces the agent's old socket; unlink it from both sides
+        old_websocket = self.get(agent_id)
+        if old_websocket is not None:
+            self.inverse.pop(old_websocket, None)
+        old_agent_id = self.inverse.get(websocket)
+        if old_agent_id is not None and old_agent_id != agent_id:
+            super().__delitem__(old_agent_id)
+        super().__setitem__(agent_id, websocket)
+        self.inverse[websocket] = agent_id
+    
+    def pop_socket(self, websocket: WebSocket) -> Optional[str]:
+        """Remove a socket and return the agent it belonged to, if still registered"""
+        agent_id = self.inverse.pop(websocket, None)
+        if agent_id is not None:
+            super().pop(agent_id, None)
+        return agent_id
+
+class WebSocketManager:
+    # One instance per process, but its attributes are read on every send
+    __slots__ = (
+        "jwt_manager", "bus", "agent_connections", "dashboard_queues",
+        "_dashboard_senders", "_dashboard_overflows", "_dashboard_overflowed", "msgpack_clients",
+        "_pending_topology", "_topology_task", "logger",
+    )
+    
+    def __init__(self, jwt_manager: Optional[JWTManager] = None, bus: Optional[WebSocketBus] = None):
+        # Shared with the REST routes so handshakes hit its validated-token cache
+        self.jwt_manager = jwt_manager
+        # Relay to the other guardian workers when running more than one
+        self.bus = bus
+        
         # Active connections
-        self.agent_connections: Dict[str, WebSocket] = {}  # agent_id -> websocket
-        self.dashboard_connections: Set[WebSocket] = set()
-        self.websocket_to_agent: Dict[WebSocket, str] = {}  # websocket -> agent_id
+        self.agent_connections = AgentSockets()  # agent_id -> websocket, and the inverse
+        # Also the dashboard registry: broadcasts iterate it directly, no snapshot
+        self.dashboard_queues: Dict[WebSocket, asyncio.Queue] = {}  # (droppable, encoded message)
+        self._dashboard_senders: Dict[WebSocket, asyncio.Task] = {}
+        self._dashboard_overflows: Dict[WebSocket, int] = {}  # consecutive overflowed drains
+        self._dashboard_overflowed: Set[WebSocket] = set()  # overflowed since the last drain
+        self.msgpack_clients: Set[WebSocket] = set()  # negotiated MSGPACK_SUBPROTOCOL
+        self._pending_topology: Optional[Dict] = None
+        self._topology_task: Optional[asyncio.Task] = None
         
         self.logger = logging.getLogger(__name__)
+    
+    def __repr__(self) -> str:
+        # Sizes of every per-socket table, so leaked entries show up in a dump
+        return (
+            f"<WebSocketManager agents={len(self.agent_connections)} "
+            f"sockets={len(self.agent_connections.inverse)} "
+            f"dashboards={len(self.dashboard_queues)} "
+            f"senders={len(self._dashboard_senders)} "
+            f"msgpack={len(self.msgpack_clients)}>"
+        )
         
+    def _negotiate_subprotocol(self, websocket: WebSocket) -> Optional[str]:
+        """Pick MessagePack framing when the client offers it"""
+        if MSGPACK_SUBPROTOCOL in websocket.scope.get('subprotocols', ()):
+            return MSGPACK_SUBPROTOCOL
+        return None
+    
+    async def _accept(self, websocket: WebSocket):
+        """Accept a connection, remembering its negotiated framing"""
+        subprotocol = self._negotiate_subprotocol(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        if subprotocol == MSGPACK_SUBPROTOCOL:
+            self.msgpack_clients.add(websocket)
+    
+    def _send_message(self, websocket: WebSocket, message: Dict) -> Awaitable[None]:
+        """Send one message in the client's negotiated format (text frames for JSON)"""
+        if websocket in self.msgpack_clients:
+            return websocket.send_bytes(_frame(_msgpack_encoder.encode(message)))
+        return websocket.send_text(_dumps(message))
+    
     async def connect_agent(self, websocket: WebSocket):
         """Accept agent WebSocket connection with JWT validation"""
         try:
@@ -33,18 +221,18 @@ class WebSocketManager:
             # Extract and validate JWT token
             token = auth_header[7:]  # Remove "Bearer " prefix
             
-            # Import JWT manager here to avoid circular imports
-            from jwt_utils import JWTManager
-            jwt_manager = JWTManager()
+            if self.jwt_manager is None:
+                self.jwt_manager = _get_jwt_manager()
             
-            payload = jwt_manager.validate_token(token)
+            # Reconnecting agents present the same token, so this is usually a cache hit
+            payload = self.jwt_manager.validate_token(token)
             if not payload:
                 self.logger.warning("WebSocket connection rejected: Invalid JWT token")
                 await websocket.close(code=1008, reason="Invalid token")
                 return
             
             # Accept the connection
-            await websocket.accept()
+            await self._accept(websocket)
             
             # Store agent info from JWT payload
             agent_id = payload.get('agent_id')
@@ -60,36 +248,71 @@ class WebSocketManager:
             except:
                 pass
     
+    async def start_bus(self):
+        """Start relaying through the bus, if one is configured"""
+        if self.bus is not None:
+            await self.bus.start(self._on_bus_message)
+    
+    async def stop_bus(self):
+        if self.bus is not None:
+            await self.bus.close()
+    
+    async def _bus_call(self, coro):
+        """Run a bus operation; local delivery carries on if Redis is unavailable"""
+        try:
+            return await coro
+        except Exception as e:
+            self.logger.warning(f"WebSocket bus operation failed: {e}")
+            return None
+    
+    async def _on_bus_message(self, channel: str, data: bytes):
+        """Deliver a message another worker published to our local sockets"""
+        origin, _, body = data.partition(b'\n')
+        if origin.decode() == self.bus.worker_id:
+            return
+        
+        if channel == DASHBOARD_CHANNEL:
+            await self.broadcast_to_dashboards(json.loads(body), body.decode('utf-8'), relay=False)
+        elif channel == AGENT_BROADCAST_CHANNEL:
+            relayed = json.loads(body)
+            await self.broadcast_to_agents(relayed['message'], relayed.get('exclude_agent'), relay=False)
+        elif channel.startswith(AGENT_CHANNEL_PREFIX):
+            relayed = json.loads(body)
+            await self.send_to_agent(relayed['agent_id'], relayed['message'], relay=False)
+    
+    async def _close_quietly(self, websocket: WebSocket):
+        """Close a socket we are dropping so the server frees its buffers; it may already be gone"""
+        try:
+            await asyncio.wait_for(websocket.close(code=1000), SEND_TIMEOUT)
+        except Exception:
+            pass
+    
     async def disconnect_agent(self, websocket: WebSocket):
         """Handle agent disconnection"""
-        agent_id = self.websocket_to_agent.get(websocket)
+        self.msgpack_clients.discard(websocket)
+        await self._close_quietly(websocket)
+        agent_id = self.agent_connections.pop_socket(websocket)
         
         if agent_id:
-            # Remove from mappings
-            self.agent_connections.pop(agent_id, None)
-            self.websocket_to_agent.pop(websocket, None)
-            
             self.logger.info(f"Agent {agent_id} disconnected")
+            if self.bus is not None:
+                await self._bus_call(self.bus.release_agent(agent_id))
             
             # Notify dashboards
             await self.broadcast_to_dashboards({
                 "type": "agent_disconnected",
                 "agent_id": agent_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             })
         else:
             self.logger.info("Unregistered agent disconnected")
     
     async def register_agent(self, websocket: WebSocket, agent_id: str):
         """Register an agent with its WebSocket connection"""
-        # Remove existing connection if any
-        if agent_id in self.agent_connections:
-            old_websocket = self.agent_connections[agent_id]
-            self.websocket_to_agent.pop(old_websocket, None)
-        
-        # Register new connection
+        # Replaces any existing connection for this agent
         self.agent_connections[agent_id] = websocket
-        self.websocket_to_agent[websocket] = agent_id
+        if self.bus is not None:
+            await self._bus_call(self.bus.claim_agent(agent_id))
         
         self.logger.info(f"Agent {agent_id} registered")
         
@@ -97,13 +320,17 @@ class WebSocketManager:
         await self.broadcast_to_dashboards({
             "type": "agent_connected",
             "agent_id": agent_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         })
     
     async def connect_dashboard(self, websocket: WebSocket):
         """Accept dashboard WebSocket connection"""
-        await websocket.accept()
-        self.dashboard_connections.add(websocket)
+        await self._accept(websocket)
+        queue = asyncio.Queue(maxsize=DASHBOARD_QUEUE_SIZE)
+        self.dashboard_queues[websocket] = queue
+        self._dashboard_senders[websocket] = asyncio.create_task(
+            self._dashboard_sender(websocket, queue, websocket in self.msgpack_clients)
+        )
         self.logger.info(f"Dashboard connected. Total dashboards: {len(self.dashboard_connections)}")
         
         # Send current agent status
@@ -111,59 +338,173 @@ class WebSocketManager:
     
     async def disconnect_dashboard(self, websocket: WebSocket):
         """Handle dashboard disconnection"""
-        self.dashboard_connections.discard(websocket)
+        queue = self.dashboard_queues.pop(websocket, None)
+        if queue is None:
+            return
+        self.msgpack_clients.discard(websocket)
+        self._dashboard_overflows.pop(websocket, None)
+        self._dashboard_overflowed.discard(websocket)
+        sender = self._dashboard_senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+        # The cancelled sender's frame keeps the queue alive until it unwinds;
+        # release the backlog of encoded messages now rather than then
+        while not queue.empty():
+            queue.get_nowait()
+        await self._close_quietly(websocket)
         self.logger.info(f"Dashboard disconnected. Total dashboards: {len(self.dashboard_connections)}")
     
-    async def send_to_agent(self, agent_id: str, message: Dict) -> bool:
-        """Send message to specific agent"""
+    async def _dashboard_sender(self, websocket: WebSocket, queue: asyncio.Queue, binary: bool):
+        """Drain everything queued for a dashboard in one wake-up"""
+        try:
+            while True:
+                batch = [(await queue.get())[1]]
+                while len(batch) < DASHBOARD_MAX_BATCH and not queue.empty():
+                    batch.append(queue.get_nowait()[1])
+                
+                # Overflows are counted per drain, not per broadcast, so a burst
+                # within one tick doesn't drop a dashboard that is keeping up
+                if websocket in self._dashboard_overflowed:
+                    self._dashboard_overflowed.discard(websocket)
+                    overflows = self._dashboard_overflows.get(websocket, 0) + 1
+                    if overflows >= DASHBOARD_MAX_OVERFLOWS:
+                        self.logger.warning("Dropping dashboard that stopped draining its send queue")
+                        await self.disconnect_dashboard(websocket)
+                        return
+                    self._dashboard_overflows[websocket] = overflows
+                else:
+                    self._dashboard_overflows.pop(websocket, None)
+                
+                # A half-open dashboard would otherwise park this task forever
+                if binary:
+                    # Items are already packed, so the batch frame is a join
+                    body = batch[0] if len(batch) == 1 else _msgpack_batch(batch)
+                    await asyncio.wait_for(websocket.send_bytes(_frame(body)), SEND_TIMEOUT)
+                else:
+                    # JSON dashboards expect one message per frame
+                    for item in batch:
+                        await asyncio.wait_for(websocket.send_text(item), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to broadcast to dashboard: {e!r}")
+            await self.disconnect_dashboard(websocket)
+    
+    def _enqueue_dashboard(self, websocket: WebSocket, payload: Union[str, bytes], droppable: bool):
+        """Queue an encoded message for one dashboard"""
+        queue = self.dashboard_queues.get(websocket)
+        if queue is None:
+            return
+        if not queue.full():
+            queue.put_nowait((droppable, payload))
+            return
+        
+        # Make room by shedding the oldest snapshot, or the oldest message if
+        # only alerts are queued
+        pending = [queue.get_nowait() for _ in range(queue.qsize())]
+        victim = next((i for i, (shed, _) in enumerate(pending) if shed), 0)
+        del pending[victim]
+        pending.append((droppable, payload))
+        for item in pending:
+            queue.put_nowait(item)
+        
+        if websocket not in self._dashboard_overflowed:
+            self._dashboard_overflowed.add(websocket)
+            self.logger.warning("Dashboard send queue full, dropping oldest messages")
+    
+    async def send_to_agent(self, agent_id: str, message: Dict, relay: bool = True) -> bool:
+        """Send message to specific agent, through the worker holding it if not local"""
         websocket = self.agent_connections.get(agent_id)
         
         if websocket:
             try:
-                await websocket.send_text(json.dumps(message))
+                await asyncio.wait_for(self._send_message(websocket, message), SEND_TIMEOUT)
                 self.logger.debug(f"Message sent to agent {agent_id}")
                 return True
             except Exception as e:
-                self.logger.error(f"Failed to send message to agent {agent_id}: {e}")
+                self.logger.error(f"Failed to send message to agent {agent_id}: {e!r}")
                 # Clean up disconnected agent
                 await self.disconnect_agent(websocket)
                 return False
-        else:
-            self.logger.warning(f"Agent {agent_id} not connected")
-            return False
+        
+        if relay and self.bus is not None:
+            owner = await self._bus_call(self.bus.agent_owner(agent_id))
+            if owner and owner != self.bus.worker_id:
+                body = _dumps_bytes({"agent_id": agent_id, "message": message})
+                receivers = await self._bus_call(
+                    self.bus.publish(AGENT_CHANNEL_PREFIX + owner, _bus_envelope(self.bus.worker_id, body))
+                )
+                # No receiver means the owning worker is gone; its entry is stale
+                return bool(receivers)
+        
+        self.logger.warning(f"Agent {agent_id} not connected")
+        return False
     
-    async def broadcast_to_agents(self, message: Dict, exclude_agent: str = None):
-        """Broadcast message to all connected agents"""
-        disconnected_agents = []
+    async def broadcast_to_agents(self, message: Dict, exclude_agent: str = None, relay: bool = True):
+        """Broadcast message to all connected agents, on every worker"""
+        if relay and self.bus is not None:
+            body = _dumps_bytes({"message": message, "exclude_agent": exclude_agent})
+            await self._bus_call(
+                self.bus.publish(AGENT_BROADCAST_CHANNEL, _bus_envelope(self.bus.worker_id, body))
+            )
         
-        for agent_id, websocket in self.agent_connections.items():
-            if exclude_agent and agent_id == exclude_agent:
-                continue
-                
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                self.logger.error(f"Failed to broadcast to agent {agent_id}: {e}")
-                disconnected_agents.append(websocket)
+        payload = _dumps(message)
+        # Compressed once here rather than per recipient
+        packed = _frame(_msgpack_encoder.encode(message)) if self.msgpack_clients else None
+        targets = [
+            (agent_id, websocket) for agent_id, websocket in self.agent_connections.items()
+            if not (exclude_agent and agent_id == exclude_agent)
+        ]
         
-        # Clean up disconnected agents
-        for websocket in disconnected_agents:
-            await self.disconnect_agent(websocket)
+        # All sends go out together; one slow agent does not hold up the rest,
+        # and one that stalls past the timeout is dropped like a failed send
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    websocket.send_bytes(packed) if websocket in self.msgpack_clients
+                    else websocket.send_text(payload),
+                    BROADCAST_SEND_TIMEOUT
+                )
+                for _, websocket in targets
+            ),
+            return_exceptions=True
+        )
+        
+        # Clean up disconnected agents; their close frames may time out too, so together
+        failed = []
+        for (agent_id, websocket), result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to broadcast to agent {agent_id}: {result!r}")
+                failed.append(self.disconnect_agent(websocket))
+        if failed:
+            await asyncio.gather(*failed)
     
-    async def broadcast_to_dashboards(self, message: Dict):
-        """Broadcast message to all connected dashboards"""
-        disconnected_dashboards = []
+    async def broadcast_to_dashboards(self, message: Dict, payload: Optional[str] = None, relay: bool = True):
+        """Broadcast message to all connected dashboards, on every worker
         
-        for websocket in self.dashboard_connections.copy():
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                self.logger.error(f"Failed to broadcast to dashboard: {e}")
-                disconnected_dashboards.append(websocket)
+        payload, when given, is the message already encoded as JSON.
+        """
+        if relay and self.bus is not None:
+            if payload is None:
+                payload = _dumps(message)
+            await self._bus_call(
+                self.bus.publish(DASHBOARD_CHANNEL, _bus_envelope(self.bus.worker_id, payload.encode('utf-8')))
+            )
         
-        # Clean up disconnected dashboards
-        for websocket in disconnected_dashboards:
-            await self.disconnect_dashboard(websocket)
+        # Encoded once for every dashboard; remediation payloads carry full metrics.
+        # Only queued here, the per-dashboard senders do the writes
+        # Enqueueing never awaits or disconnects, so the registry can't change mid-loop
+        droppable = message.get("type") in DROPPABLE_TYPES
+        packed = None
+        for websocket in self.dashboard_queues:
+            if websocket in self.msgpack_clients:
+                if packed is None:
+                    packed = _msgpack_encoder.encode(message)
+                self._enqueue_dashboard(websocket, packed, droppable)
+            else:
+                if payload is None:
+                    payload = _dumps(message)
+                self._enqueue_dashboard(websocket, payload, droppable)
     
     async def send_agent_status_to_dashboard(self, websocket: WebSocket):
         """Send current agent status to a specific dashboard"""
@@ -173,11 +514,14 @@ class WebSocketManager:
                 "data": {
                     "connected_agents": list(self.agent_connections.keys()),
                     "total_count": len(self.agent_connections),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 }
             }
             
-            await websocket.send_text(json.dumps(agent_status))
+            if websocket in self.msgpack_clients:
+                self._enqueue_dashboard(websocket, _msgpack_encoder.encode(agent_status), True)
+            else:
+                self._enqueue_dashboard(websocket, _dumps(agent_status), True)
         except Exception as e:
             self.logger.error(f"Failed to send agent status to dashboard: {e}")
     
@@ -192,6 +536,21 @@ class WebSocketManager:
             "dashboards": len(self.dashboard_connections)
         }
     
+    @property
+    def websocket_to_agent(self) -> Dict[WebSocket, str]:
+        """websocket -> agent_id side of agent_connections (read-only by convention)"""
+        return self.agent_connections.inverse
+    
+    @property
+    def dashboard_connections(self) -> KeysView[WebSocket]:
+        """Live view of connected dashboards"""
+        return self.dashboard_queues.keys()
+    
+    @property
+    def connected_agents(self) -> KeysView[str]:
+        """Live set view of connected agent IDs for bulk membership checks"""
+        return self.agent_connections.keys()
+    
     def is_agent_connected(self, agent_id: str) -> bool:
         """Check if agent is connected"""
         return agent_id in self.agent_connections
@@ -200,7 +559,7 @@ class WebSocketManager:
         """Send health check to specific agent"""
         message = {
             "type": "health_check",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
         
         return await self.send_to_agent(agent_id, message)
@@ -210,37 +569,49 @@ class WebSocketManager:
         message = {
             "type": "failover",
             "target_agent": target_agent,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
         
         return await self.send_to_agent(agent_id, message)
     
-    async def notify_anomaly_to_dashboards(self, anomaly_data: Dict):
-        """Notify dashboards about detected anomaly"""
+    async def _broadcast_data_message(self, message_type: str, data: Dict):
+        """Broadcast a fixed-shape data message, encoding only its data"""
+        timestamp = _now_iso()
         message = {
-            "type": "anomaly_alert",
-            "data": anomaly_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "type": message_type,
+            "data": data,
+            "timestamp": timestamp
         }
         
-        await self.broadcast_to_dashboards(message)
+        await self.broadcast_to_dashboards(
+            message, _DATA_MESSAGE_ENCODERS[message_type](_dumps(data), timestamp)
+        )
+    
+    async def notify_anomaly_to_dashboards(self, anomaly_data: Dict):
+        """Notify dashboards about detected anomaly"""
+        await self._broadcast_data_message("anomaly_alert", anomaly_data)
     
     async def notify_remediation_to_dashboards(self, remediation_data: Dict):
         """Notify dashboards about remediation action"""
-        message = {
-            "type": "remediation_action",
-            "data": remediation_data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        await self.broadcast_to_dashboards(message)
+        await self._broadcast_data_message("remediation_action", remediation_data)
     
     async def send_topology_update(self, topology_data: Dict):
-        """Send network topology update to dashboards"""
-        message = {
-            "type": "topology_update",
-            "data": topology_data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        """Send network topology update to dashboards
         
-        await self.broadcast_to_dashboards(message)
+        Trailing-edge debounced: a burst of updates (e.g. agents reconnecting
+        after a restart) becomes one broadcast of the last snapshot.
+        """
+        self._pending_topology = topology_data
+        if self._topology_task is None:
+            self._topology_task = asyncio.create_task(self._flush_topology_after(TOPOLOGY_DEBOUNCE))
+    
+    async def _flush_topology_after(self, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._topology_task = None
+        topology_data, self._pending_topology = self._pending_topology, None
+        try:
+            await self._broadcast_data_message("topology_update", topology_data)
+        except Exception as e:
+            self.logger.error(f"Failed to broadcast topology update: {e}")
@@ -4,7 +4,6 @@ Aegis of Alderaan - Quick Launch with Neo4j Features
 Launch Guardian, Agent, and test Neo4j relationships & self-healing
 """
 
-import subprocess
 import asyncio
 import time
 import os
@@ -18,20 +17,28 @@ logger = logging.getLogger(__name__)
 class AegisLauncher:
     def __init__(self):
         self.processes = []
+        self.output_tasks = []  # keep the drain tasks referenced while they run
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         
     def cleanup(self):
-        """Clean up all processes"""
+        """Ask all processes to stop"""
         logger.info("🧹 Cleaning up processes...")
         for process in self.processes:
             try:
-                if process.poll() is None:  # Process still running
+                if process.returncode is None:  # Process still running
                     process.terminate()
-                    process.wait(timeout=5)
-            except:
+            except ProcessLookupError:
+                pass
+    
+    async def wait_stopped(self, timeout=5):
+        """Wait for terminated processes, killing any that linger"""
+        for process in self.processes:
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
                 try:
                     process.kill()
-                except:
+                except ProcessLookupError:
                     pass
         self.processes.clear()
     
@@ -41,20 +48,17 @@ class AegisLauncher:
         self.cleanup()
         sys.exit(0)
     
-    def start_guardian_server(self):
+    async def start_guardian_server(self):
         """Start Guardian server"""
         logger.info("🛡️ Starting Guardian Server...")
         guardian_dir = os.path.join(self.base_dir, "guardian-server")
         
         try:
-            process = subprocess.Popen(
-                ["python", "app.py"],
+            process = await asyncio.create_subprocess_exec(
+                "python", "app.py",
                 cwd=guardian_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
             )
             self.processes.append(process)
             logger.info("✅ Guardian Server process started")
@@ -63,20 +67,17 @@ class AegisLauncher:
             logger.error(f"❌ Failed to start Guardian Server: {e}")
             return None
     
-    def start_agent(self):
+    async def start_agent(self):
         """Start an agent"""
         logger.info("🤖 Starting Agent...")
         agent_dir = os.path.join(self.base_dir, "agent")
         
         try:
-            process = subprocess.Popen(
-                ["python", "main.py"],
+            process = await asyncio.create_subprocess_exec(
+                "python", "main.py",
                 cwd=agent_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
             )
             self.processes.append(process)
             logger.info("✅ Agent process started")
@@ -86,17 +87,24 @@ class AegisLauncher:
             return None
     
     def monitor_process_output(self, process, name, max_lines=10):
-        """Monitor process output"""
+        """Show the first lines of a process's output in the background"""
+        self.output_tasks.append(asyncio.create_task(self._drain_output(process, name, max_lines)))
+    
+    async def _drain_output(self, process, name, max_lines):
+        """Print up to max_lines, then keep reading so the child never blocks on a full pipe"""
         lines_shown = 0
         try:
-            for line in process.stdout:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
                 if lines_shown < max_lines:
-                    print(f"[{name}] {line.strip()}")
+                    print(f"[{name}] {line.decode('utf-8', errors='replace').strip()}")
                     lines_shown += 1
                 elif lines_shown == max_lines:
                     print(f"[{name}] ... (output continues)")
                     lines_shown += 1
-        except:
+        except Exception:
             pass
     
     async def wait_for_services(self, timeout=30):
@@ -106,17 +114,18 @@ class AegisLauncher:
         import aiohttp
         start_time = time.time()
         
-        while time.time() - start_time < timeout:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get("http://localhost:3001/health", timeout=2) as response:
+        # One session for every poll, so retries reuse its connector
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
+            while time.time() - start_time < timeout:
+                try:
+                    async with session.get("http://localhost:3001/health") as response:
                         if response.status == 200:
                             logger.info("✅ Guardian Server is ready!")
                             return True
-            except:
-                pass
-            
-            await asyncio.sleep(2)
+                except:
+                    pass
+                
+                await asyncio.sleep(2)
         
         logger.warning("⚠️ Services may not be fully ready")
         return False
@@ -248,35 +257,26 @@ async def main():
         logger.info("🚀 Starting Aegis of Alderaan with Neo4j Features")
         
         # Start Guardian Server
-        guardian_process = launcher.start_guardian_server()
+        guardian_process = await launcher.start_guardian_server()
         if not guardian_process:
             logger.error("❌ Failed to start Guardian Server")
             return
+        # Output is shown while the services come up, not after
+        launcher.monitor_process_output(guardian_process, "Guardian", 5)
         
         # Wait for Guardian to start
         await asyncio.sleep(5)
         
         # Start Agent
-        agent_process = launcher.start_agent()
+        agent_process = await launcher.start_agent()
         if not agent_process:
             logger.error("❌ Failed to start Agent")
-            launcher.cleanup()
             return
+        launcher.monitor_process_output(agent_process, "Agent", 5)
         
         # Wait for services to be ready
         await launcher.wait_for_services()
         
-        # Show some output from processes
-        print("\n" + "="*60)
-        print("RECENT GUARDIAN OUTPUT:")
-        print("="*60)
-        launcher.monitor_process_output(guardian_process, "Guardian", 5)
-        
-        print("\n" + "="*60)
-        print("RECENT AGENT OUTPUT:")
-        print("="*60)
-        launcher.monitor_process_output(agent_process, "Agent", 5)
-        
         # Check command line arguments
         if len(sys.argv) > 1:
             if sys.argv[1] == "--quick":
@@ -304,6 +304,7 @@ async def main():
         logger.error(f"❌ Launch failed: {e}")
     finally:
         launcher.cleanup()
+        await launcher.wait_stopped()
         logger.info("👋 Aegis shutdown complete")
 
 if __name__ == "__main__":
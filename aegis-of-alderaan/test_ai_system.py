@@ -256,8 +256,8 @@ class AISystemTester:
             mirror_recommendation='should_activate',
             estimated_recovery_time=20,
             confidence_score=0.85,
-            immediate_actions=['Restart Apache', 'Clear cache', 'Kill hung processes'],
-            preventive_measures=['Monitor resources', 'Set up alerts']
+            immediate_actions=('Restart Apache', 'Clear cache', 'Kill hung processes'),
+            preventive_measures=('Monitor resources', 'Set up alerts')
         )
         
         try: